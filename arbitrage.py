@@ -97,4 +97,10 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop is optional: faster event loop on Linux/macOS, falls back to the default loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     sys.exit(asyncio.run(main()))
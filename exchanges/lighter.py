@@ -79,8 +79,8 @@ class LighterClient(BaseExchangeClient):
             for market in order_books.order_books:
                 if market.symbol == ticker:
                     market_id = market.market_id
-                    base_multiplier = pow(10, market.supported_size_decimals)
-                    price_multiplier = pow(10, market.supported_price_decimals)
+                    base_multiplier = 10 ** market.supported_size_decimals
+                    price_multiplier = 10 ** market.supported_price_decimals
 
                     # Store market info for later use
                     self.config.market_info = market
@@ -541,11 +541,11 @@ class LighterClient(BaseExchangeClient):
         order_book_details = market_summary.order_book_details[0]
         # Set contract_id to market name (Lighter uses market IDs as identifiers)
         self.config.contract_id = market_info.market_id
-        self.base_amount_multiplier = pow(10, market_info.supported_size_decimals)
-        self.price_multiplier = pow(10, market_info.supported_price_decimals)
+        self.base_amount_multiplier = 10 ** market_info.supported_size_decimals
+        self.price_multiplier = 10 ** market_info.supported_price_decimals
 
         try:
-            self.config.tick_size = Decimal("1") / (Decimal("10") ** order_book_details.price_decimals)
+            self.config.tick_size = Decimal(1).scaleb(-order_book_details.price_decimals)
         except Exception:
             self.logger.log("Failed to get tick size", "ERROR")
             raise ValueError("Failed to get tick size")
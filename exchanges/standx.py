@@ -10,10 +10,10 @@ import base64
 import time
 import asyncio
 import logging
-import traceback
 import uuid
 import websockets
 import aiohttp
+import orjson
 from decimal import Decimal
 from typing import Dict, Any, List, Optional, Tuple, Callable
 
@@ -35,10 +35,12 @@ except ImportError:
     from exchange.exchange_standx.standx_protocol.perp_http import StandXPerpHTTP
 
 # 引入 Solana 依赖
-import base58
 import requests
 from solders.keypair import Keypair
 
+# 签名 payload 中 input 部分按顺序取自 JWT 的字段
+_SIGN_FIELDS = ("domain", "address", "statement", "uri", "version", "chainId", "nonce", "issuedAt", "requestId")
+
 
 class Config:
     """Simple config class to wrap dictionary."""
@@ -54,11 +56,15 @@ class StandXWebSocketManager:
     文档: StandX Perps WebSocket API List -> Market Stream
     URL: wss://perps.standx.com/ws-stream/v1
     """
-    def __init__(self, token: str, logger, on_message_callback: Callable):
+    def __init__(self, token: str, logger, on_message_callback: Callable,
+                 symbol: Optional[str] = None, on_price_callback: Optional[Callable] = None):
         self.url = "wss://perps.standx.com/ws-stream/v1"
         self.token = token
         self.logger = logger
         self.on_message_callback = on_message_callback
+        # 行情推送 (price channel)，用于替代 REST 轮询 BBO
+        self.symbol = symbol
+        self.on_price_callback = on_price_callback
         
         self._ws = None
         self._running = False
@@ -89,7 +95,8 @@ class StandXWebSocketManager:
                 self.logger.info(f"🔌 [WS] Connecting to {self.url}...")
                 # ping_interval=None: 禁用客户端主动 Ping，因为服务器会每10秒 Ping 我们
                 # websockets 库会自动回复 Pong
-                async with websockets.connect(self.url, ping_interval=None) as ws:
+                # compression=None: 跳过 permessage-deflate，每帧省一次 zlib 解压
+                async with websockets.connect(self.url, ping_interval=None, compression=None) as ws:
                     self._ws = ws
                     self.logger.info("✅ [WS] Connected")
 
@@ -134,10 +141,15 @@ class StandXWebSocketManager:
         await self._ws.send(json.dumps(auth_payload))
         self.logger.info("📤 [WS] Sent Auth & Subscription")
 
+        # 订阅公共行情 (price channel)，推送 spread_bid / spread_ask
+        if self.on_price_callback and self.symbol:
+            await self._ws.send(json.dumps({"subscribe": {"channel": "price", "symbol": self.symbol}}))
+            self.logger.info(f"📤 [WS] Subscribed to price channel: {self.symbol}")
+
     def _handle_message(self, message: str):
         """处理收到的 WebSocket 消息"""
         try:
-            data = json.loads(message)
+            data = orjson.loads(message)
 
             # 1. 处理鉴权响应
             # {"channel": "auth", "data": {"code": 0, "message": "success"}}
@@ -153,11 +165,20 @@ class StandXWebSocketManager:
 
             # 2. 处理订单更新
             # {"channel": "order", "data": {...}}
-            if data.get("channel") == "order":
+            channel = data.get("channel")
+            if channel == "order":
                 order_data = data.get("data", {})
                 if order_data:
                     self.on_message_callback(order_data)
 
+            # 3. 处理行情更新
+            # {"channel": "price", "symbol": "BTC-USD", "data": {"spread_bid": ..., "spread_ask": ...}}
+            elif channel == "price" and self.on_price_callback:
+                # 没有 data 包裹时把整条消息交给回调，由回调解析或告警，避免静默丢弃
+                price_data = data.get("data") or data
+                if isinstance(price_data, dict):
+                    self.on_price_callback(price_data)
+
         except Exception as e:
             self.logger.error(f"❌ [WS] Parse error: {e}, Message: {message[:100]}")
 
@@ -204,15 +225,26 @@ class StandXClient(BaseExchangeClient):
         self._setup_wallet()
 
         # 4. 初始化组件
+        # 复用 keep-alive 连接池 (每次 requests.get 都会新建连接并重新 TLS 握手)
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         self.http_client = StandXPerpHTTP(base_url=self.base_url)
         # Solana keypair is Ed25519: first 32 bytes = private key seed
         ed25519_private_key = bytes(self.solana_keypair)[:32]
         self.auth_client = StandXAuth(private_key=ed25519_private_key)
         self.token = None
 
+        # 最近一次成功查询的持仓及其 monotonic 时间戳 (供 position tracker 复用)
+        self.cached_position: Optional[Decimal] = None
+        self.cached_position_ts = 0.0
+
         # WebSocket 管理器
         self.ws_manager = None
         self._order_update_handler = None
+        self._bbo_handler = None
+        self._price_shape_warned = False  # price 推送缺少可用 bid/ask 时只告警一次
 
         # 5. 合约配置 (类似 EdgeX/Lighter)
         self.config.contract_id = self.symbol
@@ -236,8 +268,12 @@ class StandXClient(BaseExchangeClient):
         """加载 Solana 钱包"""
         try:
             clean_key = self.private_key.replace("0x", "").strip()
-            self.solana_keypair = Keypair.from_bytes(base58.b58decode(clean_key))
-            self.wallet_address = str(self.solana_keypair.pubkey())
+            # solders 在 Rust 里直接解码 base58 keypair，无需纯 Python 的 base58 大数运算
+            self.solana_keypair = Keypair.from_base58_string(clean_key)
+            pubkey = self.solana_keypair.pubkey()
+            self.wallet_address = str(pubkey)
+            # 登录签名 payload 需要的公钥字节数组，加载时算一次
+            self._pubkey_bytes_list = list(bytes(pubkey))
             self.logger.info(f"StandX Wallet loaded: {self.wallet_address}")
         except Exception as e:
             self.logger.error(f"Failed to load Solana wallet: {e}")
@@ -254,7 +290,7 @@ class StandXClient(BaseExchangeClient):
             await asyncio.to_thread(self._perform_login)
 
             # 2. 如果配置了 WS 回调，启动 WS
-            if self._order_update_handler:
+            if self._order_update_handler or self._bbo_handler:
                 await self._start_websocket()
 
         except Exception as e:
@@ -267,15 +303,17 @@ class StandXClient(BaseExchangeClient):
             self.ws_manager = StandXWebSocketManager(
                 token=self.token,
                 logger=self.logger,
-                on_message_callback=self._on_ws_order_update
+                on_message_callback=self._on_ws_order_update,
+                symbol=self.symbol,
+                on_price_callback=self._on_ws_price_update if self._bbo_handler else None
             )
             await self.ws_manager.start()
 
     def _perform_login(self):
         """同步登录逻辑 (Base64 JSON Payload 模式)"""
         # 1. Prepare
-        req_id = str(self.solana_keypair.pubkey())
-        resp = requests.post(
+        req_id = self.wallet_address
+        resp = self._session.post(
             f"{self.auth_url}/v1/offchain/prepare-signin?chain=solana",
             json={"address": self.wallet_address, "requestId": req_id}
         )
@@ -290,8 +328,8 @@ class StandXClient(BaseExchangeClient):
 
         # 2. Parse JWT & Sign
         parts = signed_data_jwt.split('.')
-        padded = parts[1] + '=' * (4 - len(parts[1]) % 4)
-        jwt_payload = json.loads(base64.b64decode(padded).decode('utf-8'))
+        # JWT 段是无填充的 base64url；多余的 '=' 解码时会被忽略
+        jwt_payload = json.loads(base64.urlsafe_b64decode(parts[1] + '=='))
         
         msg_bytes = jwt_payload.get("message").encode('utf-8')
         raw_sig = bytes(self.solana_keypair.sign_message(msg_bytes))
@@ -300,7 +338,7 @@ class StandXClient(BaseExchangeClient):
         final_sig = self._construct_complex_signature(jwt_payload, raw_sig, msg_bytes)
 
         # 4. Login
-        resp = requests.post(
+        resp = self._session.post(
             f"{self.auth_url}/v1/offchain/login?chain=solana",
             json={
                 "signature": final_sig,
@@ -327,25 +365,15 @@ class StandXClient(BaseExchangeClient):
     def _construct_complex_signature(self, jwt_payload: dict, raw_sig: bytes, msg_bytes: bytes) -> str:
         """Construct Solana signature format for StandX"""
         # StandX 需要复杂的 JSON 签名结构
-        input_data = {
-            "domain": jwt_payload.get("domain"),
-            "address": jwt_payload.get("address"),
-            "statement": jwt_payload.get("statement"),
-            "uri": jwt_payload.get("uri"),
-            "version": jwt_payload.get("version"),
-            "chainId": jwt_payload.get("chainId"),
-            "nonce": jwt_payload.get("nonce"),
-            "issuedAt": jwt_payload.get("issuedAt"),
-            "requestId": jwt_payload.get("requestId")
-        }
+        input_data = {k: jwt_payload.get(k) for k in _SIGN_FIELDS}
         output_data = {
-            "account": {"publicKey": list(bytes(self.solana_keypair.pubkey()))},
+            "account": {"publicKey": self._pubkey_bytes_list},
             "signature": list(raw_sig),
             "signedMessage": list(msg_bytes)
         }
         complex_obj = {"input": input_data, "output": output_data}
-        json_str = json.dumps(complex_obj, separators=(',', ':'))
-        return base64.b64encode(json_str.encode('utf-8')).decode('utf-8')
+        # orjson 输出紧凑的 UTF-8 bytes，可直接 base64，省掉 dumps + encode 两步
+        return base64.b64encode(orjson.dumps(complex_obj)).decode('ascii')
 
     def _on_ws_order_update(self, order_data: dict):
         """WebSocket order update callback"""
@@ -356,13 +384,35 @@ class StandXClient(BaseExchangeClient):
         """Setup order update handler for WebSocket (BaseExchangeClient interface)"""
         self._order_update_handler = handler
 
+    def _on_ws_price_update(self, price_data: dict):
+        """WebSocket price update callback: forward (bid, ask) as Decimals"""
+        bid = price_data.get("spread_bid")
+        ask = price_data.get("spread_ask")
+        if not (bid and ask):
+            # 推送格式可能与 REST 不同: {"spread": [bid, ask]}
+            spread = price_data.get("spread")
+            if isinstance(spread, (list, tuple)) and len(spread) >= 2:
+                bid, ask = spread[0], spread[1]
+        if bid and ask:
+            self._bbo_handler(Decimal(str(bid)), Decimal(str(ask)))
+        elif not self._price_shape_warned:
+            # 格式不符时 WS BBO 永远不会就绪，交易循环只能走 REST ticker；打一次日志让问题可见
+            self._price_shape_warned = True
+            self.logger.warning(
+                f"⚠️ [WS] price message has no usable bid/ask (keys: {sorted(price_data)}), "
+                f"BBO will fall back to REST ticker: {str(price_data)[:200]}")
+
+    def setup_bbo_handler(self, handler: Callable[[Decimal, Decimal], None]) -> None:
+        """Setup BBO handler fed by the WebSocket price channel (must be set before connect())"""
+        self._bbo_handler = handler
+
     def get_ticker(self, symbol: str) -> dict:
         """Get ticker data for symbol (required by trading loop)"""
         try:
             # 使用 StandX 的 query_symbol_price API
             url = f"{self.base_url}/api/query_symbol_price"
             params = {"symbol": symbol}
-            resp = requests.get(url, params=params, timeout=5)
+            resp = self._session.get(url, params=params, timeout=5)
             if not resp.ok:
                 self.logger.error(f"Failed to get ticker: {resp.status_code} - {resp.text}")
                 return {"bid_price": 0, "ask_price": 0}
@@ -460,8 +510,7 @@ class StandXClient(BaseExchangeClient):
             )
 
         except Exception as e:
-            self.logger.error(f"Exception placing order: {e}")
-            traceback.print_exc()
+            self.logger.exception(f"Exception placing order: {e}")
             return OrderResult(
                 success=False,
                 error_message=str(e)
@@ -477,7 +526,9 @@ class StandXClient(BaseExchangeClient):
         """Cancel an order (BaseExchangeClient interface)"""
         try:
             # 使用 perp_http 的 cancel_orders 方法，需要签名
-            self.http_client.cancel_orders(
+            # 放到线程里执行：撤单往返期间事件循环继续处理 BBO / 订单推送
+            await asyncio.to_thread(
+                self.http_client.cancel_orders,
                 token=self.token,
                 cl_ord_id_list=[order_id],
                 auth=self.auth_client
@@ -509,10 +560,12 @@ class StandXClient(BaseExchangeClient):
         """Get order information (BaseExchangeClient interface)"""
         try:
             url = f"{self.base_url}/api/v1/perps/orders/{order_id}"
-            resp = requests.get(
-                url,
-                headers={"Authorization": f"Bearer {self.token}"},
-                timeout=10
+            resp = await asyncio.to_thread(
+                lambda: self._session.get(
+                    url,
+                    headers={"Authorization": f"Bearer {self.token}"},
+                    timeout=10
+                )
             )
 
             if not resp.ok:
@@ -544,11 +597,13 @@ class StandXClient(BaseExchangeClient):
         try:
             url = f"{self.base_url}/api/v1/perps/orders"
             params = {"symbol": contract_id, "status": "open"}
-            resp = requests.get(
-                url,
-                params=params,
-                headers={"Authorization": f"Bearer {self.token}"},
-                timeout=10
+            resp = await asyncio.to_thread(
+                lambda: self._session.get(
+                    url,
+                    params=params,
+                    headers={"Authorization": f"Bearer {self.token}"},
+                    timeout=10
+                )
             )
 
             if not resp.ok:
@@ -587,11 +642,13 @@ class StandXClient(BaseExchangeClient):
         try:
             url = f"{self.base_url}/api/query_positions"
             params = {"symbol": self.symbol}
-            resp = requests.get(
-                url,
-                params=params,
-                headers={"Authorization": f"Bearer {self.token}"},
-                timeout=10
+            resp = await asyncio.to_thread(
+                lambda: self._session.get(
+                    url,
+                    params=params,
+                    headers={"Authorization": f"Bearer {self.token}"},
+                    timeout=10
+                )
             )
 
             if not resp.ok:
@@ -605,13 +662,18 @@ class StandXClient(BaseExchangeClient):
                 return Decimal('0')
 
             # 找到对应 symbol 的持仓
+            position = Decimal('0')
             for pos in positions:
                 if pos.get("symbol") == self.symbol and pos.get("status") == "open":
                     # qty 表示持仓量，正数表示多头，负数表示空头
                     qty = pos.get("qty", 0)
-                    return Decimal(str(qty)) if qty else Decimal('0')
+                    if qty:
+                        position = Decimal(str(qty))
+                    break
 
-            return Decimal('0')
+            self.cached_position = position
+            self.cached_position_ts = time.monotonic()
+            return position
 
         except Exception as e:
             self.logger.error(f"Exception getting positions: {e}")
@@ -625,7 +687,7 @@ class StandXClient(BaseExchangeClient):
             url = f"{self.base_url}/api/query_symbol_price"
             params = {"symbol": self.symbol}
             resp = await asyncio.to_thread(
-                lambda: requests.get(url, params=params, timeout=10)
+                lambda: self._session.get(url, params=params, timeout=10)
             )
 
             if resp.ok:
@@ -657,6 +719,7 @@ class StandXClient(BaseExchangeClient):
             if self.ws_manager:
                 await self.ws_manager.stop()
                 self.ws_manager = None
+            self._session.close()
             self.logger.info("StandX client disconnected")
         except Exception as e:
             self.logger.error(f"Error disconnecting: {e}")
\ No newline at end of file
@@ -7,8 +7,8 @@ import time
 from typing import Literal, Optional, Dict, Any, Callable
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import serialization
-import base58
 import requests
+from solders.pubkey import Pubkey
 
 
 Chain = Literal["bsc", "solana"]
@@ -63,7 +63,8 @@ class StandXAuth:
             encoding=serialization.Encoding.Raw,
             format=serialization.PublicFormat.Raw
         )
-        self.request_id = base58.b58encode(self._public_key_bytes).decode('utf-8')
+        # solders 的 Pubkey.__str__ 是原生 base58 编码 (Solana 地址格式)
+        self.request_id = str(Pubkey.from_bytes(self._public_key_bytes))
         self.base_url = "https://api.standx.com"
     
     def authenticate(
@@ -190,7 +191,7 @@ class StandXAuth:
         message_bytes = message.encode('utf-8')
         
         signature = self._private_key.sign(message_bytes)
-        signature_b64 = base64.b64encode(signature).decode('utf-8')
+        signature_b64 = base64.b64encode(signature).decode('ascii')  # base64 output is pure ASCII
         
         return {
             "x-request-sign-version": version,
@@ -213,16 +214,8 @@ class StandXAuth:
         if len(parts) != 3:
             raise ValueError("Invalid JWT format")
         
-        # Decode base64url
-        base64_url = parts[1]
-        base64_str = base64_url.replace('-', '+').replace('_', '/')
-        # Add padding if needed
-        padding = len(base64_str) % 4
-        if padding:
-            base64_str += '=' * (4 - padding)
-        
-        decoded = base64.b64decode(base64_str)
-        return json.loads(decoded.decode('utf-8'))
+        # Decode base64url; excess '=' padding is ignored by the decoder
+        return json.loads(base64.urlsafe_b64decode(parts[1] + '=='))
     
     def export_private_key(self) -> bytes:
         """Export private key as bytes"""
@@ -3,10 +3,18 @@ import csv
 import json
 import os
 import logging
+import queue
+import threading
+import time
 from decimal import Decimal
 from datetime import datetime
 import pytz
 
+from .log_utils import ensure_logs_dir
+
+_BEIJING_TZ = pytz.timezone('Asia/Shanghai')
+_STOP = object()  # sentinel that stops the trade writer thread
+
 
 class DataLogger:
     """Handles CSV and JSON logging for trades and BBO data."""
@@ -16,11 +24,11 @@ class DataLogger:
         self.exchange = exchange
         self.ticker = ticker
         self.logger = logger
-        os.makedirs("logs", exist_ok=True)
+        logs_dir = ensure_logs_dir()
 
-        self.csv_filename = f"logs/{exchange}_{ticker}_trades.csv"
-        self.bbo_csv_filename = f"logs/{exchange}_{ticker}_bbo_data.csv"
-        self.thresholds_json_filename = f"logs/{exchange}_{ticker}_thresholds.json"
+        self.csv_filename = f"{logs_dir}/{exchange}_{ticker}_trades.csv"
+        self.bbo_csv_filename = f"{logs_dir}/{exchange}_{ticker}_bbo_data.csv"
+        self.thresholds_json_filename = f"{logs_dir}/{exchange}_{ticker}_thresholds.json"
 
         # CSV file handles for efficient writing (kept open)
         self.bbo_csv_file = None
@@ -33,13 +41,21 @@ class DataLogger:
         # Trade CSV file handles for efficient writing (kept open)
         self.trade_csv_file = None
         self.trade_csv_writer = None
-        self.trade_write_counter = 0
-        self.trade_flush_interval = 1  # Flush immediately after each trade (changed from 10)
-        self.last_trade_flush_time = None  # Initialize on first write
+        self.trade_batch_size = 100  # Max rows written per flush by the writer thread
+        self.trade_queue_size = 4096  # Bound on trades waiting for the writer thread
 
         self._initialize_trade_csv_file()
         self._initialize_bbo_csv_file()
 
+        # Trade rows are written by a background thread so fills never wait on disk I/O;
+        # once close() has stopped it, rows are written synchronously under _sync_write_lock
+        self._closed = False
+        self._sync_write_lock = threading.Lock()
+        self._trade_queue = queue.Queue(maxsize=self.trade_queue_size)
+        self._trade_writer = threading.Thread(
+            target=self._trade_writer_loop, name=f"trade-csv-{exchange}-{ticker}", daemon=True)
+        self._trade_writer.start()
+
     def _initialize_trade_csv_file(self):
         """Initialize trade CSV file with headers if it doesn't exist."""
         file_exists = os.path.exists(self.csv_filename)
@@ -78,36 +94,53 @@ class DataLogger:
             ])
             self.bbo_csv_file.flush()  # Ensure header is written immediately
 
-    def log_trade_to_csv(self, exchange: str, side: str, price: str, quantity: str):
-        """Log trade details to CSV file."""
-        import time
-
+    def log_trade_to_csv(self, exchange: str, side: str, price, quantity):
+        """Queue trade details for the CSV writer thread (price/quantity may be str or Decimal)."""
+        row = (exchange, time.time(), side, price, quantity)
+        if self._closed:
+            # Writer thread is gone (shutdown already ran): don't let the fill vanish in the queue
+            self._write_trades_sync([row])
+            return
+        try:
+            self._trade_queue.put_nowait(row)
+        except queue.Full:
+            # Never block the order callback; a full queue means the writer is stuck on disk I/O
+            self.logger.error(f"Trade CSV queue full, dropping row: {exchange} {side} {quantity} @ {price}")
+
+    def _trade_writer_loop(self):
+        """Drain queued trades in batches and append them to the trade CSV."""
+        stop = False
+        while not stop:
+            item = self._trade_queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            while len(batch) < self.trade_batch_size:
+                try:
+                    item = self._trade_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write_trades(batch)
+
+    def _write_trades(self, batch: list):
+        """Write a batch of queued trades and flush them to disk."""
         if not self.trade_csv_file or not self.trade_csv_writer:
             # Fallback: reinitialize if file handle is lost
             self._initialize_trade_csv_file()
 
-        # Use Beijing time (UTC+8) for consistency with logs
-        beijing_tz = pytz.timezone('Asia/Shanghai')
-        timestamp = datetime.now(beijing_tz).isoformat()
-
         try:
-            self.trade_csv_writer.writerow([exchange, timestamp, side, price, quantity])
-            self.trade_write_counter += 1
-
-            # Initialize timestamp on first write
-            if self.last_trade_flush_time is None:
-                self.last_trade_flush_time = time.time()
-
-            # Flush every N trades or every 30 seconds
-            current_time = time.time()
-            if (self.trade_write_counter >= self.trade_flush_interval or
-                (current_time - self.last_trade_flush_time) >= 30):
-                self.trade_csv_file.flush()
-                self.trade_write_counter = 0
-                self.last_trade_flush_time = current_time
-                #biwii self.logger.info(f"💾 Trade CSV flushed to disk")
-
-            self.logger.info(f"📊 Trade logged to CSV: {exchange} {side} {quantity} @ {price}")
+            # Use Beijing time (UTC+8) for consistency with logs
+            self.trade_csv_writer.writerows(
+                [exchange, datetime.fromtimestamp(ts, _BEIJING_TZ).isoformat(), side, price, quantity]
+                for exchange, ts, side, price, quantity in batch)
+            self.trade_csv_file.flush()
+
+            for exchange, _, side, price, quantity in batch:
+                self.logger.info(f"📊 Trade logged to CSV: {exchange} {side} {quantity} @ {price}")
         except Exception as e:
             self.logger.error(f"Error writing trade to CSV: {e}")
             # Try to reinitialize on error
@@ -118,6 +151,17 @@ class DataLogger:
                 pass
             self._initialize_trade_csv_file()
 
+    def _write_trades_sync(self, batch: list):
+        """Append trades on the calling thread after the writer has stopped, leaving the file closed."""
+        with self._sync_write_lock:
+            self._write_trades(batch)
+            try:
+                if self.trade_csv_file:
+                    self.trade_csv_file.close()
+            except (ValueError, OSError):
+                pass
+            self.trade_csv_file = None
+            self.trade_csv_writer = None
 
     def _get_log_timestamp(self):
         """
@@ -205,6 +249,29 @@ class DataLogger:
 
     def close(self):
         """Close file handles."""
+        # Let the writer thread drain pending trades before the file is closed.
+        # Flip _closed first so later fills bypass the queue and are written synchronously.
+        self._closed = True
+        if self._trade_writer.is_alive():
+            self._trade_queue.put(_STOP)
+            self._trade_writer.join(timeout=5)
+
+        # Rows queued after the sentinel (raced with _closed) are written here
+        if not self._trade_writer.is_alive():
+            leftover = []
+            while True:
+                try:
+                    item = self._trade_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    leftover.append(item)
+            if leftover:
+                with self._sync_write_lock:
+                    self._write_trades(leftover)
+        else:
+            self.logger.error("Trade CSV writer did not stop within 5s; queued trades may be lost")
+
         # Close BBO CSV file
         if self.bbo_csv_file:
             try:
@@ -223,18 +290,19 @@ class DataLogger:
                 self.bbo_csv_writer = None
 
         # Close trade CSV file
-        if self.trade_csv_file:
-            try:
-                self.trade_csv_file.flush()
-                self.trade_csv_file.close()
-                self.trade_csv_file = None
-                self.trade_csv_writer = None
-                self.logger.info("📊 Trade CSV file closed")
-            except (ValueError, OSError) as e:
-                # File already closed or I/O error - ignore silently
-                self.trade_csv_file = None
-                self.trade_csv_writer = None
-            except Exception as e:
-                self.logger.error(f"Error closing trade CSV file: {e}")
-                self.trade_csv_file = None
-                self.trade_csv_writer = None
+        with self._sync_write_lock:
+            if self.trade_csv_file:
+                try:
+                    self.trade_csv_file.flush()
+                    self.trade_csv_file.close()
+                    self.trade_csv_file = None
+                    self.trade_csv_writer = None
+                    self.logger.info("📊 Trade CSV file closed")
+                except (ValueError, OSError) as e:
+                    # File already closed or I/O error - ignore silently
+                    self.trade_csv_file = None
+                    self.trade_csv_writer = None
+                except Exception as e:
+                    self.logger.error(f"Error closing trade CSV file: {e}")
+                    self.trade_csv_file = None
+                    self.trade_csv_writer = None
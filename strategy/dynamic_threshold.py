@@ -1,4 +1,5 @@
 """Dynamic threshold calculator based on historical spread statistics."""
+import math
 import time
 from collections import deque
 from decimal import Decimal
@@ -45,28 +46,32 @@ class DynamicThresholdCalculator:
         self.short_threshold = max_threshold
 
         # Statistics
-        self.last_update_time = time.time()
+        self.last_update_time = time.monotonic()
+        self._next_update_time = self.last_update_time + update_interval
         self.long_mean = Decimal('0')
         self.long_std = Decimal('0')
         self.short_mean = Decimal('0')
         self.short_std = Decimal('0')
 
-    def add_spread_observation(self, long_spread: Decimal, short_spread: Decimal) -> None:
+    def add_spread_observation(self, long_spread: Decimal, short_spread: Decimal,
+                               now: Optional[float] = None) -> None:
         """
         Add a new spread observation to the history.
 
         Args:
             long_spread: Current long spread (lighter_bid - edgex_bid)
             short_spread: Current short spread (edgex_ask - lighter_ask)
+            now: Caller's monotonic timestamp for this tick (avoids another clock read)
         """
         self.long_spreads.append(long_spread)
         self.short_spreads.append(short_spread)
 
         # Check if we should update thresholds
-        current_time = time.time()
-        if current_time - self.last_update_time >= self.update_interval:
+        current_time = now if now is not None else time.monotonic()
+        if current_time >= self._next_update_time:
             self._update_thresholds()
             self.last_update_time = current_time
+            self._next_update_time = current_time + self.update_interval
 
     def _update_thresholds(self) -> None:
         """Recalculate thresholds based on current spread history."""
@@ -85,9 +90,7 @@ class DynamicThresholdCalculator:
         new_long_threshold = long_sorted[long_percentile_idx]
 
         # Calculate mean and std for logging
-        self.long_mean = sum(self.long_spreads, Decimal('0')) / len(self.long_spreads)
-        long_variance = sum((x - self.long_mean) ** 2 for x in self.long_spreads) / len(self.long_spreads)
-        self.long_std = long_variance.sqrt() if long_variance > 0 else Decimal('0')
+        self.long_mean, self.long_std = self._mean_std(self.long_spreads)
 
         # Calculate statistics for short spreads
         short_sorted = sorted(self.short_spreads)
@@ -95,9 +98,7 @@ class DynamicThresholdCalculator:
         new_short_threshold = short_sorted[short_percentile_idx]
 
         # Calculate mean and std for logging
-        self.short_mean = sum(self.short_spreads, Decimal('0')) / len(self.short_spreads)
-        short_variance = sum((x - self.short_mean) ** 2 for x in self.short_spreads) / len(self.short_spreads)
-        self.short_std = short_variance.sqrt() if short_variance > 0 else Decimal('0')
+        self.short_mean, self.short_std = self._mean_std(self.short_spreads)
 
         # Apply safety bounds
         new_long_threshold = max(self.min_threshold, min(self.max_threshold, new_long_threshold))
@@ -117,6 +118,15 @@ class DynamicThresholdCalculator:
         self.long_threshold = new_long_threshold
         self.short_threshold = new_short_threshold
 
+    @staticmethod
+    def _mean_std(spreads) -> Tuple[Decimal, Decimal]:
+        """Population mean/std of the window, computed in float (log-only stats, no Decimal loop)."""
+        values = [float(x) for x in spreads]
+        n = len(values)
+        mean = math.fsum(values) / n
+        variance = math.fsum((x - mean) ** 2 for x in values) / n
+        return Decimal(repr(mean)), Decimal(repr(math.sqrt(variance)))
+
     def get_thresholds(self) -> Tuple[Decimal, Decimal]:
         """
         Get current dynamic thresholds.
@@ -148,4 +158,5 @@ class DynamicThresholdCalculator:
     def force_update(self) -> None:
         """Force immediate threshold update regardless of interval."""
         self._update_thresholds()
-        self.last_update_time = time.time()
+        self.last_update_time = time.monotonic()
+        self._next_update_time = self.last_update_time + self.update_interval
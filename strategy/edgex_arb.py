@@ -8,7 +8,7 @@ import time
 import requests
 import traceback
 from decimal import Decimal
-from typing import Tuple
+from typing import Optional, Tuple
 from datetime import datetime
 import pytz
 
@@ -21,6 +21,7 @@ from .websocket_manager import WebSocketManagerWrapper
 from .order_manager import OrderManager
 from .position_tracker import PositionTracker
 from .dynamic_threshold import DynamicThresholdCalculator
+from .log_utils import beijing_time, ensure_logs_dir
 
 
 class Config:
@@ -94,6 +95,7 @@ class EdgexArb:
         self.base_amount_multiplier = None
         self.price_multiplier = None
         self.tick_size = None
+        self._lighter_market_config: Optional[Tuple[int, int, int, Decimal]] = None
 
         # Position tracker (will be initialized after clients)
         self.position_tracker = None
@@ -153,8 +155,7 @@ class EdgexArb:
 
     def _setup_logger(self):
         """Setup logging configuration."""
-        os.makedirs("logs", exist_ok=True)
-        self.log_filename = f"logs/edgex_{self.ticker}_log.txt"
+        self.log_filename = f"{ensure_logs_dir()}/edgex_{self.ticker}_log.txt"
 
         self.logger = logging.getLogger(f"arbi_{self.ticker}")
         self.logger.setLevel(logging.INFO)
@@ -186,14 +187,6 @@ class EdgexArb:
         console_formatter = logging.Formatter('%(levelname)s:%(name)s:[%(filename)s:%(lineno)d]:%(message)s')
 
         # Set timezone to UTC+8 (Beijing time)
-        def beijing_time(*args):
-            """Convert to Beijing time (UTC+8)."""
-            import time as time_module
-            utc_time = time_module.gmtime(args[0] if args else None)
-            # Add 8 hours (28800 seconds) for Beijing timezone
-            beijing_timestamp = (args[0] if args else time_module.time()) + 28800
-            return time_module.gmtime(beijing_timestamp)
-
         file_formatter.converter = beijing_time
         console_formatter.converter = beijing_time
 
@@ -587,6 +580,10 @@ class EdgexArb:
             self.logger.error(f"❌ 平仓时出错: {e}")
 
         # 3. 关闭 EdgeX client (closes aiohttp sessions) with timeout
+        try:
+            await self.order_manager.stop_edgex_keepalive()
+        except Exception as e:
+            self.logger.error(f"Error stopping EdgeX keepalive: {e}")
         try:
             if self.edgex_client:
                 await asyncio.wait_for(
@@ -599,6 +596,15 @@ class EdgexArb:
         except Exception as e:
             self.logger.error(f"Error closing EdgeX client: {e}")
 
+        # Close position tracker HTTP session
+        try:
+            if self.position_tracker:
+                await asyncio.wait_for(self.position_tracker.close(), timeout=2.0)
+        except asyncio.TimeoutError:
+            self.logger.warning("⚠️ Timeout closing position tracker session")
+        except Exception as e:
+            self.logger.error(f"Error closing position tracker session: {e}")
+
         # Close EdgeX WebSocket manager connections
         try:
             if self.edgex_ws_manager:
@@ -619,6 +625,8 @@ class EdgexArb:
         except Exception as e:
             self.logger.error(f"Error cancelling Lighter WebSocket task: {e}")
 
+        self.order_manager.shutdown_sign_executor()
+
         # Flush all logging handlers before exit
         try:
             for handler in self.logger.handlers:
@@ -723,6 +731,10 @@ class EdgexArb:
     """
     def get_lighter_market_config(self) -> Tuple[int, int, int, Decimal]:
         """Get Lighter market configuration."""
+        # Market decimals don't change during a run; fetch once and reuse
+        if self._lighter_market_config is not None:
+            return self._lighter_market_config
+
         url = f"{self.lighter_base_url}/api/v1/orderBooks"
         headers = {"accept": "application/json"}
 
@@ -740,11 +752,12 @@ class EdgexArb:
 
             for market in data["order_books"]:
                 if market["symbol"] == self.ticker:
-                    price_multiplier = pow(10, market["supported_price_decimals"])
-                    return (market["market_id"],
-                            pow(10, market["supported_size_decimals"]),
-                            price_multiplier,
-                            Decimal("1") / (Decimal("10") ** market["supported_price_decimals"]))
+                    price_decimals = market["supported_price_decimals"]
+                    self._lighter_market_config = (market["market_id"],
+                                                   10 ** market["supported_size_decimals"],
+                                                   10 ** price_decimals,
+                                                   Decimal(1).scaleb(-price_decimals))
+                    return self._lighter_market_config
             raise Exception(f"Ticker {self.ticker} not found")
 
         except Exception as e:
@@ -824,6 +837,7 @@ class EdgexArb:
         self.order_manager.set_lighter_config(
             self.lighter_client, self.lighter_market_index,
             self.base_amount_multiplier, self.price_multiplier, self.tick_size)
+        self.order_manager.start_edgex_keepalive()
 
         self.ws_manager.set_edgex_ws_manager(self.edgex_ws_manager, self.edgex_contract_id)
         self.ws_manager.set_lighter_config(
@@ -888,6 +902,10 @@ class EdgexArb:
 
         self.logger.info(f"📍 Starting main trading loop for {self.ticker}")
 
+        # (book seq, thresholds, position, close stage) at the last evaluated iteration
+        last_eval_key = None
+        last_spread_observation = None  # (long, short) spreads from the last evaluated book
+
         # Main trading loop
         while not self.stop_flag:
             # 定期同步持仓（每60秒验证一次缓存的持仓与实际持仓是否一致）
@@ -955,6 +973,29 @@ class EdgexArb:
                             f"⚠️ [Position Imbalance] EdgeX={edgex_pos}, Lighter={lighter_pos}, Net={net_position}")
                         self.last_imbalance_warning_time = current_time
 
+            # Book, thresholds, position and close stage all unchanged since the last evaluation:
+            # the spreads were already rejected, so skip the decision block unless the status log is due.
+            # 阈值重算、成交后持仓变化、平仓阶段推进都不会改变 seq，因此一并纳入比较
+            if self.use_dynamic_threshold:
+                eval_thresholds = self.dynamic_threshold.get_thresholds()
+            else:
+                eval_thresholds = (self.long_ex_threshold, self.short_ex_threshold)
+            eval_position = self.position_tracker.get_current_edgex_position()
+            eval_stage = (self._get_time_based_close_thresholds(eval_thresholds[1])[2]
+                          if eval_position != 0 else "default")
+            eval_key = (self.order_book_manager.seq, eval_thresholds, eval_position, eval_stage)
+            status_log_due = (self.last_status_log_time is None or
+                              current_time - self.last_status_log_time >= self.bbo_log_interval)
+            if (eval_key == last_eval_key and self.order_book_manager.edgex_order_book_ready and
+                    not status_log_due):
+                # Still sample the (unchanged) spreads every tick so the dynamic-threshold
+                # percentiles keep the same per-tick weighting as before the skip existed
+                if last_spread_observation is not None:
+                    self.dynamic_threshold.add_spread_observation(*last_spread_observation)
+                await asyncio.sleep(0.01)
+                continue
+            last_eval_key = eval_key
+
             # Optimize: Try to get BBO from WebSocket cache first (synchronous, fast)
             ex_best_bid, ex_best_ask = self.order_book_manager.get_edgex_bbo()
 
@@ -984,6 +1025,9 @@ class EdgexArb:
             # Add spread observation to dynamic threshold calculator
             if lighter_bid and ex_best_bid and ex_best_ask and lighter_ask:
                 self.dynamic_threshold.add_spread_observation(long_spread, short_spread)
+                last_spread_observation = (long_spread, short_spread)
+            else:
+                last_spread_observation = None
 
             # Get current thresholds (dynamic or fixed)
             if self.use_dynamic_threshold:
@@ -1202,6 +1246,9 @@ class EdgexArb:
         self.order_manager.order_execution_complete = False
         self.order_manager.waiting_for_lighter_fill = False
 
+        # Arm the hedge before placing the EdgeX order so it fires as soon as the fill callback lands
+        hedge_task = asyncio.create_task(self._hedge_on_edgex_fill())
+
         try:
             side = 'buy'
             order_start = time.time()
@@ -1217,8 +1264,10 @@ class EdgexArb:
             self.logger.info(f"⏱️ EdgeX order placement: {order_time:.3f}s")
 
             if not order_filled or self.stop_flag:
+                await self._settle_hedge_task(hedge_task)
                 return
         except Exception as e:
+            await self._settle_hedge_task(hedge_task)
             if self.stop_flag:
                 return
 
@@ -1308,24 +1357,7 @@ class EdgexArb:
             self.stop_flag = True
             return
 
-        start_time = time.time()
-        while not self.order_manager.order_execution_complete and not self.stop_flag:
-            if self.order_manager.waiting_for_lighter_fill:
-                hedge_start = time.time()
-                await self.order_manager.place_lighter_market_order(
-                    self.order_manager.current_lighter_side,
-                    self.order_manager.current_lighter_quantity,
-                    self.order_manager.current_lighter_price,
-                    self.stop_flag
-                )
-                hedge_time = time.time() - hedge_start
-                self.logger.info(f"⏱️ Lighter hedge placement: {hedge_time:.3f}s")
-                break
-
-            await asyncio.sleep(0.01)
-            if time.time() - start_time > 180:
-                self.logger.error("❌ Timeout waiting for trade completion")
-                break
+        await hedge_task
 
         total_time = time.time() - trade_start_time
         self.logger.info(f"⏱️ LONG TRADE TOTAL EXECUTION: {total_time:.3f}s")
@@ -1333,6 +1365,40 @@ class EdgexArb:
         # 交易完成后验证持仓平衡
         await self._verify_position_balance_after_trade("LONG")
 
+    async def _hedge_on_edgex_fill(self):
+        """Wait for the EdgeX fill callback and place the Lighter hedge immediately."""
+        om = self.order_manager
+        # Woken by the fill callback setting waiting_for_lighter_fill (no polling)
+        if not await om.wait_for_hedge_signal(180):
+            if not self.stop_flag and not om.order_execution_complete:
+                self.logger.error("❌ Timeout waiting for trade completion")
+            return
+        if om.order_execution_complete:
+            return
+
+        hedge_start = time.time()
+        await om.place_lighter_market_order(
+            om.current_lighter_side,
+            om.current_lighter_quantity,
+            om.current_lighter_price,
+            self.stop_flag
+        )
+        hedge_time = time.time() - hedge_start
+        self.logger.info(f"⏱️ Lighter hedge placement: {hedge_time:.3f}s")
+
+    async def _settle_hedge_task(self, hedge_task: asyncio.Task):
+        """Finish an in-flight hedge, or cancel the watcher if no fill arrived."""
+        if self.order_manager.waiting_for_lighter_fill:
+            # EdgeX already filled (possibly partially) - the hedge must complete
+            await hedge_task
+            return
+
+        hedge_task.cancel()
+        try:
+            await hedge_task
+        except asyncio.CancelledError:
+            pass
+
     async def _verify_position_balance_after_trade(self, trade_type: str):
         """验证交易完成后的持仓平衡."""
         try:
@@ -1445,6 +1511,9 @@ class EdgexArb:
         self.order_manager.order_execution_complete = False
         self.order_manager.waiting_for_lighter_fill = False
 
+        # Arm the hedge before placing the EdgeX order so it fires as soon as the fill callback lands
+        hedge_task = asyncio.create_task(self._hedge_on_edgex_fill())
+
         try:
             side = 'sell'
             order_start = time.time()
@@ -1460,8 +1529,10 @@ class EdgexArb:
             self.logger.info(f"⏱️ EdgeX order placement: {order_time:.3f}s")
 
             if not order_filled or self.stop_flag:
+                await self._settle_hedge_task(hedge_task)
                 return
         except Exception as e:
+            await self._settle_hedge_task(hedge_task)
             if self.stop_flag:
                 return
 
@@ -1551,24 +1622,7 @@ class EdgexArb:
             self.stop_flag = True
             return
 
-        start_time = time.time()
-        while not self.order_manager.order_execution_complete and not self.stop_flag:
-            if self.order_manager.waiting_for_lighter_fill:
-                hedge_start = time.time()
-                await self.order_manager.place_lighter_market_order(
-                    self.order_manager.current_lighter_side,
-                    self.order_manager.current_lighter_quantity,
-                    self.order_manager.current_lighter_price,
-                    self.stop_flag
-                )
-                hedge_time = time.time() - hedge_start
-                self.logger.info(f"⏱️ Lighter hedge placement: {hedge_time:.3f}s")
-                break
-
-            await asyncio.sleep(0.01)
-            if time.time() - start_time > 180:
-                self.logger.error("❌ Timeout waiting for trade completion")
-                break
+        await hedge_task
 
         total_time = time.time() - trade_start_time
         self.logger.info(f"⏱️ SHORT TRADE TOTAL EXECUTION: {total_time:.3f}s")
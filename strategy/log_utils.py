@@ -0,0 +1,45 @@
+"""Logging helpers shared by the arbitrage bots."""
+import logging
+import logging.handlers
+import os
+import queue
+import time
+
+LOGS_DIR = "logs"
+_BJ_OFFSET = 28800  # UTC+8 in seconds
+_logs_ready = False
+
+
+def ensure_logs_dir() -> str:
+    """Create the logs directory once per process and return its path."""
+    global _logs_ready
+    if not _logs_ready:
+        os.makedirs(LOGS_DIR, exist_ok=True)
+        _logs_ready = True
+    return LOGS_DIR
+
+
+def beijing_time(secs=None):
+    """logging.Formatter converter: struct_time in Beijing time (UTC+8)."""
+    return time.gmtime((secs if secs is not None else time.time()) + _BJ_OFFSET)
+
+
+class DropQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks the event loop: no formatting here, drop on full queue."""
+
+    def prepare(self, record):
+        # Formatting happens on the listener thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+class LogQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() waits for room instead of raising on a full queue."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
@@ -1,6 +1,7 @@
 """Order book management for EdgeX and Lighter exchanges."""
 import asyncio
 import logging
+import time
 from decimal import Decimal
 from typing import Tuple, Optional
 
@@ -28,6 +29,19 @@ class OrderBookManager:
         self.lighter_snapshot_loaded = False
         self.lighter_order_book_lock = asyncio.Lock()
 
+        # StandX top of book (pushed by the StandX price stream)
+        self.standx_best_bid: Optional[Decimal] = None
+        self.standx_best_ask: Optional[Decimal] = None
+        self.standx_bbo_time: float = 0.0  # time.monotonic() of the last StandX BBO update
+
+        # Incremented on every BBO-affecting update so consumers can skip unchanged books
+        self.seq = 0
+        # Set on every Lighter/StandX BBO update (both run on the event loop) to wake the trading loop
+        self.bbo_updated = asyncio.Event()
+        # Set once each side has published its first two-sided BBO
+        self.standx_bbo_ready = asyncio.Event()
+        self.lighter_bbo_ready = asyncio.Event()
+
     # EdgeX order book methods
     def update_edgex_order_book(self, bids: list, asks: list):
         """Update EdgeX order book with new levels."""
@@ -35,7 +49,7 @@ class OrderBookManager:
         for bid in bids:
             price = Decimal(bid['price'])
             size = Decimal(bid['size'])
-            if size > 0:
+            if size > 0 and price > 0:
                 self.edgex_order_book['bids'][price] = size
             else:
                 self.edgex_order_book['bids'].pop(price, None)
@@ -44,7 +58,7 @@ class OrderBookManager:
         for ask in asks:
             price = Decimal(ask['price'])
             size = Decimal(ask['size'])
-            if size > 0:
+            if size > 0 and price > 0:
                 self.edgex_order_book['asks'][price] = size
             else:
                 self.edgex_order_book['asks'].pop(price, None)
@@ -54,6 +68,7 @@ class OrderBookManager:
             self.edgex_best_bid = max(self.edgex_order_book['bids'].keys())
         if self.edgex_order_book['asks']:
             self.edgex_best_ask = min(self.edgex_order_book['asks'].keys())
+        self.seq += 1
 
         if not self.edgex_order_book_ready:
             self.edgex_order_book_ready = True
@@ -67,6 +82,25 @@ class OrderBookManager:
         """Get EdgeX best bid/ask prices."""
         return self.edgex_best_bid, self.edgex_best_ask
 
+    # StandX BBO methods
+    def update_standx_bbo(self, best_bid: Decimal, best_ask: Decimal):
+        """Update StandX best bid/ask from the price stream."""
+        self.standx_bbo_time = time.monotonic()
+        if best_bid == self.standx_best_bid and best_ask == self.standx_best_ask:
+            return
+        self.standx_best_bid = best_bid
+        self.standx_best_ask = best_ask
+        self.seq += 1
+        self.bbo_updated.set()
+        if best_bid > 0 and best_ask > 0:
+            self.standx_bbo_ready.set()
+
+    def get_standx_bbo(self, max_age: float = None) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+        """Get StandX best bid/ask prices, or (None, None) if older than max_age seconds."""
+        if max_age is not None and time.monotonic() - self.standx_bbo_time > max_age:
+            return None, None
+        return self.standx_best_bid, self.standx_best_ask
+
     # Lighter order book methods
     async def reset_lighter_order_book(self):
         """Reset Lighter order book state."""
@@ -78,6 +112,7 @@ class OrderBookManager:
             self.lighter_snapshot_loaded = False
             self.lighter_best_bid = None
             self.lighter_best_ask = None
+            self.seq += 1
 
     def update_lighter_order_book(self, side: str, levels: list):
         """Update Lighter order book with new levels."""
@@ -157,3 +192,7 @@ class OrderBookManager:
             self.lighter_best_bid = best_bid[0]
         if best_ask is not None:
             self.lighter_best_ask = best_ask[0]
+        self.seq += 1
+        self.bbo_updated.set()
+        if self.lighter_best_bid is not None and self.lighter_best_ask is not None:
+            self.lighter_bbo_ready.set()
@@ -1,13 +1,19 @@
 """Order placement and monitoring for EdgeX and Lighter exchanges."""
 import asyncio
+import functools
 import logging
 import time
-from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, ROUND_HALF_EVEN
 from typing import Optional
 
 from edgex_sdk import Client, OrderSide, CancelOrderParams, GetOrderBookDepthParams
 from lighter.signer_client import SignerClient
 
+# Lighter taker slippage (0.5%) applied to the opposite best level
+_BUY_SLIP = Decimal('1.005')
+_SELL_SLIP = Decimal('0.995')
+
 
 class OrderManager:
     """Manages order placement and monitoring for both exchanges."""
@@ -21,8 +27,13 @@ class OrderManager:
         self.edgex_client: Optional[Client] = None
         self.edgex_contract_id: Optional[str] = None
         self.edgex_tick_size: Optional[Decimal] = None
+        self._tick_exp: int = 0   # exponent of edgex_tick_size
+        self._tick_int: int = 1   # edgex_tick_size as integer units of 10**_tick_exp
         self.edgex_order_status: Optional[str] = None
         self.edgex_client_order_id: str = ''
+        self._side_buy = OrderSide.BUY
+        self._side_sell = OrderSide.SELL
+        self._last_client_order_id = 0
 
         # Lighter client and config
         self.lighter_client: Optional[SignerClient] = None
@@ -30,6 +41,17 @@ class OrderManager:
         self.base_amount_multiplier: Optional[int] = None
         self.price_multiplier: Optional[int] = None
         self.tick_size: Optional[Decimal] = None
+        # Decimal copies of the multipliers, built once for the order hot path
+        self._base_mul_dec: Optional[Decimal] = None
+        self._price_mul_dec: Optional[Decimal] = None
+        # Single worker so signing (and the signer's nonce handling) stays serialized
+        self._sign_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lighter-sign")
+
+        # Event signaling (set from WebSocket callbacks, possibly on another thread)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._edgex_status_event = asyncio.Event()
+        self._lighter_fill_event = asyncio.Event()
+        self._hedge_ready_event = asyncio.Event()
 
         # Lighter order state
         self.lighter_order_filled = False
@@ -51,11 +73,69 @@ class OrderManager:
         self.last_ws_warning_time = None
         self.ws_warning_interval = 60  # Only warn every 60 seconds
 
+        # Short-lived cache for REST BBO fallback (monotonic_ts, bid, ask)
+        self._rest_bbo_cache: Optional[tuple] = None
+        self.rest_bbo_cache_ttl = 0.2  # seconds
+        # Consecutive REST fallbacks; the cache TTL doubles with each, up to rest_backoff_max
+        self._rest_fallback_count = 0
+        self.rest_backoff_max = 2.0  # seconds
+
+        # Keep the EdgeX REST connection warm so fallbacks/cancels skip the TLS handshake
+        self._edgex_keepalive_task: Optional[asyncio.Task] = None
+        self.edgex_keepalive_interval = 30  # seconds
+
+    @property
+    def lighter_order_filled(self) -> bool:
+        """Whether the current Lighter order has been filled."""
+        return self._lighter_order_filled
+
+    @lighter_order_filled.setter
+    def lighter_order_filled(self, filled: bool):
+        """Set the Lighter fill flag and wake monitor_lighter_order on fill."""
+        self._lighter_order_filled = filled
+        if filled:
+            self._notify(self._lighter_fill_event)
+        else:
+            self._lighter_fill_event.clear()
+
+    @property
+    def waiting_for_lighter_fill(self) -> bool:
+        """Whether a maker fill has been reported and is waiting for its Lighter hedge."""
+        return self._waiting_for_lighter_fill
+
+    @waiting_for_lighter_fill.setter
+    def waiting_for_lighter_fill(self, waiting: bool):
+        """Set the hedge-pending flag and wake wait_for_hedge_signal when it is raised."""
+        self._waiting_for_lighter_fill = waiting
+        if waiting:
+            self._notify(self._hedge_ready_event)
+        else:
+            self._hedge_ready_event.clear()
+
+    async def wait_for_hedge_signal(self, timeout: float) -> bool:
+        """Wait until a maker fill is flagged for hedging. Returns False on timeout."""
+        if self.waiting_for_lighter_fill:
+            return True
+        self._loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(self._hedge_ready_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.waiting_for_lighter_fill
+
+    def release_hedge_wait(self):
+        """Wake wait_for_hedge_signal without a fill (maker order confirmed cancelled)."""
+        self._notify(self._hedge_ready_event)
+
     def set_edgex_config(self, client: Client, contract_id: str, tick_size: Decimal):
         """Set EdgeX client and configuration."""
         self.edgex_client = client
         self.edgex_contract_id = contract_id
         self.edgex_tick_size = tick_size
+        if tick_size is not None:
+            # Precompute integer tick representation for round_to_tick
+            self._tick_exp = tick_size.as_tuple().exponent
+            self._tick_int = int(tick_size.scaleb(-self._tick_exp))
 
     def set_lighter_config(self, client: SignerClient, market_index: int,
                            base_amount_multiplier: int, price_multiplier: int, tick_size: Decimal):
@@ -65,28 +145,116 @@ class OrderManager:
         self.base_amount_multiplier = base_amount_multiplier
         self.price_multiplier = price_multiplier
         self.tick_size = tick_size
+        self._base_mul_dec = Decimal(base_amount_multiplier)
+        self._price_mul_dec = Decimal(price_multiplier)
+
+    def start_edgex_keepalive(self):
+        """Start the background pinger that keeps the EdgeX REST connection alive."""
+        if self._edgex_keepalive_task is None or self._edgex_keepalive_task.done():
+            self._edgex_keepalive_task = asyncio.create_task(self._edgex_keepalive_pinger())
+
+    async def stop_edgex_keepalive(self):
+        """Cancel the EdgeX keepalive pinger."""
+        task = self._edgex_keepalive_task
+        self._edgex_keepalive_task = None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def shutdown_sign_executor(self):
+        """Release the Lighter signing worker thread; call once from the bot's cleanup path."""
+        self._sign_executor.shutdown(wait=False)
+
+    async def _edgex_keepalive_pinger(self):
+        """Periodically hit a cheap EdgeX REST endpoint so the pooled connection is reused."""
+        depth_params = GetOrderBookDepthParams(contract_id=self.edgex_contract_id, limit=15)
+        while True:
+            await asyncio.sleep(self.edgex_keepalive_interval)
+            try:
+                await self.edgex_client.quote.get_order_book_depth(depth_params)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.debug(f"EdgeX keepalive ping failed: {e}")
 
     def set_callbacks(self, on_order_filled: callable = None):
         """Set callback functions."""
         self.on_order_filled = on_order_filled
 
+    def _notify(self, event: asyncio.Event):
+        """Set an event from any thread, waking the coroutine waiting on it."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            event.set()
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            event.set()
+        else:
+            loop.call_soon_threadsafe(event.set)
+
+    async def _wait_for_edgex_status(self, timeout: float):
+        """Wait until the EdgeX order status changes or the timeout expires."""
+        try:
+            await asyncio.wait_for(self._edgex_status_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._edgex_status_event.clear()
+
+    def _next_client_order_id(self) -> int:
+        """Millisecond-epoch client order id, strictly increasing within this process."""
+        cid = max(time.time_ns() // 1_000_000, self._last_client_order_id + 1)
+        self._last_client_order_id = cid
+        return cid
+
+    async def _bbo_suffix(self) -> str:
+        """Current EdgeX BBO formatted for order event logs."""
+        try:
+            bid, ask = await self.fetch_edgex_bbo_prices()
+            return f"Market BBO: bid={bid}, ask={ask}"
+        except Exception as e:
+            return f"(Failed to fetch BBO: {e})"
+
+    async def _wait_for_edgex_final_status(self, timeout: float) -> bool:
+        """Wait until the EdgeX order leaves the open/canceling states. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self.edgex_order_status in ('NEW', 'OPEN', 'PENDING', 'CANCELING'):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await self._wait_for_edgex_status(remaining)
+        return True
+
     def round_to_tick(self, price: Decimal) -> Decimal:
         """Round price to tick size."""
         if self.edgex_tick_size is None:
             return price
-        return (price / self.edgex_tick_size).quantize(Decimal('1')) * self.edgex_tick_size
+        scaled = price.scaleb(-self._tick_exp)
+        if self._tick_int == 1:
+            # Tick is a power of ten: a single integral rounding is enough
+            return scaled.to_integral_value(rounding=ROUND_HALF_EVEN).scaleb(self._tick_exp)
+        q = (scaled / self._tick_int).to_integral_value(rounding=ROUND_HALF_EVEN)
+        return Decimal(int(q) * self._tick_int).scaleb(self._tick_exp)
 
     async def fetch_edgex_bbo_prices(self) -> tuple[Decimal, Decimal]:
         """Fetch best bid/ask prices from EdgeX using websocket data."""
         # Use WebSocket data if available
         edgex_bid, edgex_ask = self.order_book_manager.get_edgex_bbo()
+        # OrderBookManager only publishes positive prices, so a non-crossed book is enough
         if (self.order_book_manager.edgex_order_book_ready and
-                edgex_bid and edgex_ask and edgex_bid > 0 and edgex_ask > 0 and edgex_bid < edgex_ask):
+                edgex_bid is not None and edgex_ask is not None and edgex_bid < edgex_ask):
+            self._rest_fallback_count = 0
             return edgex_bid, edgex_ask
 
         # Fallback to REST API if websocket data is not available
         # Only log warning every 60 seconds to avoid spam
-        current_time = time.time()
+        current_time = time.monotonic()
         if self.last_ws_warning_time is None or (current_time - self.last_ws_warning_time >= self.ws_warning_interval):
             self.logger.warning("WebSocket BBO data not available, falling back to REST API")
             self.last_ws_warning_time = current_time
@@ -94,6 +262,15 @@ class OrderManager:
         if not self.edgex_client:
             raise Exception("EdgeX client not initialized")
 
+        # Collapse repeated REST fallbacks within the TTL into one request; during a
+        # sustained WebSocket outage the TTL backs off exponentially (0.2s → 2s)
+        cache = self._rest_bbo_cache
+        if cache is not None:
+            max_age = min(self.rest_backoff_max,
+                          self.rest_bbo_cache_ttl * (2 ** min(self._rest_fallback_count, 10)))
+            if time.monotonic() - cache[0] < max_age:
+                return cache[1], cache[2]
+
         depth_params = GetOrderBookDepthParams(contract_id=self.edgex_contract_id, limit=15)
         order_book = await self.edgex_client.quote.get_order_book_depth(depth_params)
         order_book_data = order_book['data']
@@ -102,42 +279,48 @@ class OrderManager:
         bids = order_book_entry.get('bids', [])
         asks = order_book_entry.get('asks', [])
 
-        best_bid = Decimal(bids[0]['price']) if bids and len(bids) > 0 else Decimal('0')
-        best_ask = Decimal(asks[0]['price']) if asks and len(asks) > 0 else Decimal('0')
+        best_bid = Decimal(bids[0]['price']) if bids else Decimal('0')
+        best_ask = Decimal(asks[0]['price']) if asks else Decimal('0')
 
+        self._rest_bbo_cache = (time.monotonic(), best_bid, best_ask)
+        self._rest_fallback_count += 1
         return best_bid, best_ask
 
     async def place_bbo_order(self, side: str, quantity: Decimal) -> str:
         """Place a BBO order on EdgeX."""
         best_bid, best_ask = await self.fetch_edgex_bbo_prices()
 
-        self.logger.info(f"💰 [Price Check] EdgeX BBO before placing order: bid={best_bid}, ask={best_ask}")
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        if log_info:
+            self.logger.info("💰 [Price Check] EdgeX BBO before placing order: bid=%s, ask=%s", best_bid, best_ask)
 
         if side.lower() == 'buy':
             order_price = best_ask - self.edgex_tick_size
-            order_side = OrderSide.BUY
-            self.logger.info(
-                f"📊 [Buy Order] Calculated price: ask({best_ask}) - tick_size({self.edgex_tick_size}) = {order_price}")
+            order_side = self._side_buy
+            if log_info:
+                self.logger.info("📊 [Buy Order] Calculated price: ask(%s) - tick_size(%s) = %s",
+                                 best_ask, self.edgex_tick_size, order_price)
         else:
             order_price = best_bid + self.edgex_tick_size
-            order_side = OrderSide.SELL
-            self.logger.info(
-                f"📊 [Sell Order] Calculated price: bid({best_bid}) + tick_size({self.edgex_tick_size}) = {order_price}")
+            order_side = self._side_sell
+            if log_info:
+                self.logger.info("📊 [Sell Order] Calculated price: bid(%s) + tick_size(%s) = %s",
+                                 best_bid, self.edgex_tick_size, order_price)
 
         rounded_price = self.round_to_tick(order_price)
-        self.logger.info(f"🔢 [Price Rounding] {order_price} → {rounded_price} (after rounding to tick)")
 
-        self.edgex_client_order_id = str(int(time.time() * 1000))
+        self.edgex_client_order_id = str(self._next_client_order_id())
 
-        self.logger.info(
-            f"📤 [Sending Order] EdgeX {side.upper()} order: "
-            f"quantity={quantity}, price={rounded_price}, post_only=True, "
-            f"client_order_id={self.edgex_client_order_id}")
+        if log_info:
+            self.logger.info("🔢 [Price Rounding] %s → %s (after rounding to tick)", order_price, rounded_price)
+            self.logger.info(
+                "📤 [Sending Order] EdgeX %s order: quantity=%s, price=%s, post_only=True, client_order_id=%s",
+                side.upper(), quantity, rounded_price, self.edgex_client_order_id)
 
         order_result = await self.edgex_client.create_limit_order(
             contract_id=self.edgex_contract_id,
-            size=str(quantity),
-            price=str(rounded_price),
+            size=format(quantity, 'f'),
+            price=format(rounded_price, 'f'),
             side=order_side,
             post_only=True,
             client_order_id=self.edgex_client_order_id
@@ -150,7 +333,7 @@ class OrderManager:
         if not order_id:
             raise Exception("No order ID in response")
 
-        self.logger.info(f"✅ [Order Placed] EdgeX order_id={order_id}, waiting for fill...")
+        self.logger.info("✅ [Order Placed] EdgeX order_id=%s, waiting for fill...", order_id)
 
         return order_id
 
@@ -169,112 +352,109 @@ class OrderManager:
             raise Exception("EdgeX client not initialized")
 
         self.edgex_order_status = None
-        self.logger.info(f"[OPEN] [EdgeX] [{side}] Placing EdgeX POST-ONLY order")
+        self._loop = asyncio.get_running_loop()
+        self._edgex_status_event.clear()
+        self.logger.info("[OPEN] [EdgeX] [%s] Placing EdgeX POST-ONLY order", side)
         order_id = await self.place_bbo_order(side, quantity)
 
-        start_time = time.time()
+        start_time = time.monotonic()
         spread_check_interval = 0.2  # Check spread every 200ms
-        last_spread_check = time.time()
+        last_spread_check = time.monotonic()
 
         cancel_requested = False  # Track if we've requested cancellation
 
         while not stop_flag:
             # Check if spread has disappeared (only if arb_direction and threshold provided)
-            if arb_direction and threshold and time.time() - last_spread_check >= spread_check_interval:
-                last_spread_check = time.time()
+            if arb_direction and threshold and time.monotonic() - last_spread_check >= spread_check_interval:
+                last_spread_check = time.monotonic()
                 spread_gone = await self._check_spread_disappeared(arb_direction, threshold)
                 if spread_gone and self.edgex_order_status in ['NEW', 'OPEN', 'PENDING'] and not cancel_requested:
                     self.logger.warning(
-                        f"⚠️ [Spread Disappeared] Canceling order {order_id} - "
-                        f"spread no longer meets threshold {threshold}")
+                        "⚠️ [Spread Disappeared] Canceling order %s - spread no longer meets threshold %s",
+                        order_id, threshold)
                     try:
                         cancel_params = CancelOrderParams(order_id=order_id)
                         await self.edgex_client.cancel_order(cancel_params)
                         cancel_requested = True
-                        self.logger.info(f"✅ [Spread Cancel] Order {order_id} canceled due to spread disappearance")
+                        self.logger.info("✅ [Spread Cancel] Order %s canceled due to spread disappearance", order_id)
                         # Don't return immediately - wait for status confirmation
                     except Exception as e:
-                        self.logger.error(f"❌ Error canceling order on spread disappearance: {e}")
+                        self.logger.error("❌ Error canceling order on spread disappearance: %s", e)
 
             # CANCELED with no fill - truly canceled, return False
             # Note: CANCELED with fill is converted to FILLED by edgex_arb._handle_edgex_order_update
             if self.edgex_order_status == 'CANCELED':
-                try:
-                    current_bid, current_ask = await self.fetch_edgex_bbo_prices()
-                    self.logger.warning(
-                        f"⚠️ [EdgeX Order CANCELED] Order {order_id} was canceled (no fill). "
-                        f"Market BBO: bid={current_bid}, ask={current_ask}")
-                except Exception as e:
-                    self.logger.warning(
-                        f"⚠️ [EdgeX Order CANCELED] Order {order_id} was canceled (no fill). "
-                        f"(Failed to fetch BBO: {e})")
+                self.logger.warning("⚠️ [EdgeX Order CANCELED] Order %s was canceled (no fill). %s",
+                                    order_id, await self._bbo_suffix())
                 return False
             elif self.edgex_order_status in ['NEW', 'OPEN', 'PENDING', 'CANCELING']:
-                await asyncio.sleep(0.5)
+                # Wake on the next status update; otherwise re-check at most every 0.5s,
+                # and exactly at the 5s cancel deadline
+                remaining = 5 - (time.monotonic() - start_time)
+                await self._wait_for_edgex_status(min(0.5, remaining) if remaining > 0 else 0.5)
                 # Only timeout if we haven't requested cancellation due to spread disappearance
-                if time.time() - start_time > 5 and not cancel_requested:
-                    elapsed = time.time() - start_time
-                    # Fetch current market price at timeout
-                    try:
-                        current_bid, current_ask = await self.fetch_edgex_bbo_prices()
-                        self.logger.warning(
-                            f"⚠️ [EdgeX Order Timeout] Order {order_id} not filled after {elapsed:.1f}s. "
-                            f"Current status: {self.edgex_order_status}. "
-                            f"Market BBO at timeout: bid={current_bid}, ask={current_ask}. Attempting to cancel...")
-                    except Exception as e:
-                        self.logger.warning(
-                            f"⚠️ [EdgeX Order Timeout] Order {order_id} not filled after {elapsed:.1f}s. "
-                            f"Current status: {self.edgex_order_status}. "
-                            f"(Failed to fetch current market price: {e}). Attempting to cancel...")
+                if time.monotonic() - start_time > 5 and not cancel_requested:
+                    elapsed = time.monotonic() - start_time
+                    self.logger.warning(
+                        "⚠️ [EdgeX Order Timeout] Order %s not filled after %.1fs. Current status: %s. "
+                        "%s. Attempting to cancel...",
+                        order_id, elapsed, self.edgex_order_status, await self._bbo_suffix())
                     try:
                         cancel_params = CancelOrderParams(order_id=order_id)
                         cancel_result = await self.edgex_client.cancel_order(cancel_params)
                         if not cancel_result or 'data' not in cancel_result:
                             self.logger.error("❌ Error canceling EdgeX order - no valid response")
                         else:
-                            self.logger.info(f"✅ [EdgeX Order Cancel Request Sent] Order {order_id} cancel request successful")
+                            self.logger.info("✅ [EdgeX Order Cancel Request Sent] Order %s cancel request successful",
+                                             order_id)
+                            # Wait for the cancel confirmation itself rather than the next poll.
+                            # Without a terminal status the order may still be open or fill later:
+                            # keep looping so the cancel is re-sent until CANCELED/FILLED arrives.
+                            if not await self._wait_for_edgex_final_status(2.0):
+                                self.logger.warning(
+                                    "⚠️ [EdgeX Order Cancel] No final status 2s after cancel request. "
+                                    "Current status: %s. Re-sending cancel...", self.edgex_order_status)
+                            continue
                     except Exception as e:
-                        self.logger.error(f"❌ Error canceling EdgeX order: {e}")
+                        self.logger.error("❌ Error canceling EdgeX order: %s", e)
                 # Timeout for spread-cancel: wait max 3s for status confirmation
-                elif cancel_requested and time.time() - start_time > 8:
+                elif cancel_requested and time.monotonic() - start_time > 8:
                     self.logger.warning(
-                        f"⚠️ [Spread Cancel Timeout] Waited too long for status after cancel request. "
-                        f"Current status: {self.edgex_order_status}")
+                        "⚠️ [Spread Cancel Timeout] Waited too long for status after cancel request. "
+                        "Current status: %s", self.edgex_order_status)
                     return False
             # PARTIALLY_FILLED is a terminal state with partial execution - treat as success
             elif self.edgex_order_status == 'PARTIALLY_FILLED':
                 self.logger.info(
-                    f"✅ [EdgeX Partial Fill] Order {order_id} partially filled, proceeding with hedge")
+                    "✅ [EdgeX Partial Fill] Order %s partially filled, proceeding with hedge", order_id)
                 break
             elif self.edgex_order_status == 'FILLED':
                 break
             else:
                 if self.edgex_order_status is not None:
-                    self.logger.error(f"❌ Unknown EdgeX order status: {self.edgex_order_status}")
+                    self.logger.error("❌ Unknown EdgeX order status: %s", self.edgex_order_status)
                     return False
                 else:
-                    await asyncio.sleep(0.5)
+                    await self._wait_for_edgex_status(0.5)
         return True
 
     def handle_edgex_order_update(self, order_data: dict):
         """Handle EdgeX order update."""
-        side = order_data.get('side', '').lower()
-        filled_size = order_data.get('filled_size')
-        price = order_data.get('price', '0')
-
-        if side == 'buy':
-            lighter_side = 'sell'
+        get = order_data.get
+        price = get('price')
+        self.current_lighter_side = 'sell' if get('side', '').lower() == 'buy' else 'buy'
+        self.current_lighter_quantity = get('filled_size')
+        if isinstance(price, Decimal):
+            # Caller already parsed it (StandX handler); skip the re-conversion
+            self.current_lighter_price = price
         else:
-            lighter_side = 'buy'
-
-        self.current_lighter_side = lighter_side
-        self.current_lighter_quantity = filled_size
-        self.current_lighter_price = Decimal(price)
+            self.current_lighter_price = Decimal(price) if price else Decimal(0)
         self.waiting_for_lighter_fill = True
 
     def update_edgex_order_status(self, status: str):
         """Update EdgeX order status."""
         self.edgex_order_status = status
+        self._notify(self._edgex_status_event)
 
     async def _check_spread_disappeared(self, arb_direction: str, threshold: Decimal) -> bool:
         """Check if the arbitrage spread has disappeared.
@@ -319,9 +499,11 @@ class OrderManager:
         if not best_bid or not best_ask:
             raise Exception("Lighter order book not ready")
 
-        self.logger.info(
-            f"💰 [Price Check] Lighter BBO before placing order: "
-            f"bid={best_bid[0]} (size={best_bid[1]}), ask={best_ask[0]} (size={best_ask[1]})")
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        if log_info:
+            self.logger.info(
+                "💰 [Price Check] Lighter BBO before placing order: bid=%s (size=%s), ask=%s (size=%s)",
+                best_bid[0], best_bid[1], best_ask[0], best_ask[1])
 
         original_price = price
         if lighter_side.lower() == 'buy':
@@ -329,38 +511,43 @@ class OrderManager:
             is_ask = False
             # Lighter 没有手续费，使用更激进的价格确保立即成交（taker）
             # 直接使用卖一价加上一定滑点，确保吃掉卖单
-            price = best_ask[0] * Decimal('1.005')  # 增加到 0.5% 滑点确保成交
-            self.logger.info(
-                f"📊 [Buy Order - Taker] Price adjustment: best_ask({best_ask[0]}) × 1.005 = {price} "
-                f"(EdgeX reference price: {original_price})")
+            price = best_ask[0] * _BUY_SLIP  # 增加到 0.5% 滑点确保成交
+            if log_info:
+                self.logger.info(
+                    "📊 [Buy Order - Taker] Price adjustment: best_ask(%s) × 1.005 = %s (EdgeX reference price: %s)",
+                    best_ask[0], price, original_price)
         else:
             order_type = "OPEN"
             is_ask = True
             # Lighter 没有手续费，使用更激进的价格确保立即成交（taker）
             # 直接使用买一价减去一定滑点，确保吃掉买单
-            price = best_bid[0] * Decimal('0.995')  # 减少到 0.5% 滑点确保成交
-            self.logger.info(
-                f"📊 [Sell Order - Taker] Price adjustment: best_bid({best_bid[0]}) × 0.995 = {price} "
-                f"(EdgeX reference price: {original_price})")
+            price = best_bid[0] * _SELL_SLIP  # 减少到 0.5% 滑点确保成交
+            if log_info:
+                self.logger.info(
+                    "📊 [Sell Order - Taker] Price adjustment: best_bid(%s) × 0.995 = %s (EdgeX reference price: %s)",
+                    best_bid[0], price, original_price)
 
+        self._loop = asyncio.get_running_loop()
         self.lighter_order_filled = False
         self.lighter_order_price = price
         self.lighter_order_side = lighter_side
         self.lighter_order_size = quantity
 
         try:
-            client_order_index = int(time.time() * 1000)
+            client_order_index = self._next_client_order_id()
 
-            base_amount_raw = int(quantity * self.base_amount_multiplier)
-            price_raw = int(price * self.price_multiplier)
+            base_amount_raw = int(quantity * self._base_mul_dec)
+            price_raw = int(price * self._price_mul_dec)
 
-            self.logger.info(
-                f"📤 [Sending Order] Lighter {lighter_side.upper()} order (IOC - Taker): "
-                f"quantity={quantity} (raw={base_amount_raw}), "
-                f"price={price} (raw={price_raw}), "
-                f"is_ask={is_ask}, client_order_id={client_order_index}")
+            if log_info:
+                self.logger.info(
+                    "📤 [Sending Order] Lighter %s order (IOC - Taker): quantity=%s (raw=%s), price=%s (raw=%s), "
+                    "is_ask=%s, client_order_id=%s",
+                    lighter_side.upper(), quantity, base_amount_raw, price, price_raw, is_ask, client_order_index)
 
-            tx_type, tx_info, tx_hash, error = self.lighter_client.sign_create_order(
+            # Sign off the event loop so WebSocket callbacks keep being serviced meanwhile
+            sign = functools.partial(
+                self.lighter_client.sign_create_order,
                 market_index=self.lighter_market_index,
                 client_order_index=client_order_index,
                 base_amount=base_amount_raw,
@@ -372,24 +559,34 @@ class OrderManager:
                 trigger_price=0,
                 order_expiry=self.lighter_client.DEFAULT_IOC_EXPIRY,  # IOC 订单必须使用 0 作为 expiry
             )
+            tx_type, tx_info, tx_hash, error = await asyncio.get_running_loop().run_in_executor(
+                self._sign_executor, sign)
             if error is not None:
                 raise Exception(f"Sign error: {error}")
 
-            # Send transaction
-            await self.lighter_client.send_tx(
-                tx_type=tx_type,
-                tx_info=tx_info
-            )
+            # Arm the fill monitor before sending: an IOC fill can arrive over WS before send_tx returns
+            monitor_task = asyncio.create_task(self.monitor_lighter_order(client_order_index, stop_flag))
 
-            self.logger.info(
-                f"✅ [Order Sent] Lighter [{order_type}] {lighter_side.upper()}: "
-                f"{quantity} @ {price}, tx_hash={tx_hash[:10]}..., waiting for fill...")
+            # Send transaction
+            try:
+                await self.lighter_client.send_tx(
+                    tx_type=tx_type,
+                    tx_info=tx_info
+                )
+            except BaseException:
+                monitor_task.cancel()
+                raise
+
+            if log_info:
+                self.logger.info(
+                    "✅ [Order Sent] Lighter [%s] %s: %s @ %s, tx_hash=%.10s..., waiting for fill...",
+                    order_type, lighter_side.upper(), quantity, price, tx_hash)
 
-            await self.monitor_lighter_order(client_order_index, stop_flag)
+            await monitor_task
 
             return tx_hash
         except Exception as e:
-            self.logger.error(f"❌ Error placing Lighter order: {e}")
+            self.logger.error("❌ Error placing Lighter order: %s", e)
             return None
 # 如果等不到，就回滚，使用市价成交，order_execution_complete实现了确保EdgeX和Lighter的订单都完成才进入下一轮交易
 
@@ -417,42 +614,46 @@ class OrderManager:
 
     async def monitor_lighter_order(self, client_order_index: int, stop_flag):
         """Monitor Lighter order and wait for fill."""
-        start_time = time.time()
-        while not self.lighter_order_filled and not stop_flag:
-            if time.time() - start_time > 30:
-                elapsed = time.time() - start_time
-                self.logger.error(
-                    f"❌ Timeout waiting for Lighter order fill after {elapsed:.1f}s")
-
-                # Try to query order status before giving up
-                self.logger.info(f"🔍 Querying Lighter order status for client_order_id={client_order_index}")
-
-                try:
-                    # Query order status from Lighter API
-                    order_status = await self.query_lighter_order_status(client_order_index)
-
-                    if order_status and order_status.get('status') == 'FILLED':
-                        self.logger.info(f"✅ Found filled order via API query!")
-                        # Process the order fill
-                        self.handle_lighter_order_filled(order_status)
-                    else:
-                        self.logger.warning(
-                            f"⚠️ Order not filled or not found. Status: {order_status.get('status') if order_status else 'UNKNOWN'}")
-                        self.logger.warning("⚠️ Using fallback - marking order as filled to continue trading")
-                        self.lighter_order_filled = True
-                        self.waiting_for_lighter_fill = False
-                        self.order_execution_complete = True
-
-                except Exception as e:
-                    self.logger.error(f"❌ Error querying order status: {e}")
-                    self.logger.warning("⚠️ Using fallback - marking order as filled to continue trading")
-                    self.lighter_order_filled = True
-                    self.waiting_for_lighter_fill = False
-                    self.order_execution_complete = True
+        if self.lighter_order_filled or stop_flag:
+            return
 
-                break
+        start_time = time.monotonic()
+        try:
+            # Set by the lighter_order_filled setter when the fill callback arrives
+            await asyncio.wait_for(self._lighter_fill_event.wait(), timeout=30)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+        elapsed = time.monotonic() - start_time
+        self.logger.error(
+            f"❌ Timeout waiting for Lighter order fill after {elapsed:.1f}s")
 
-            await asyncio.sleep(0.1)
+        # Try to query order status before giving up
+        self.logger.info(f"🔍 Querying Lighter order status for client_order_id={client_order_index}")
+
+        try:
+            # Query order status from Lighter API
+            order_status = await self.query_lighter_order_status(client_order_index)
+
+            if order_status and order_status.get('status') == 'FILLED':
+                self.logger.info(f"✅ Found filled order via API query!")
+                # Process the order fill
+                self.handle_lighter_order_filled(order_status)
+            else:
+                self.logger.warning(
+                    f"⚠️ Order not filled or not found. Status: {order_status.get('status') if order_status else 'UNKNOWN'}")
+                self.logger.warning("⚠️ Using fallback - marking order as filled to continue trading")
+                self.lighter_order_filled = True
+                self.waiting_for_lighter_fill = False
+                self.order_execution_complete = True
+
+        except Exception as e:
+            self.logger.error(f"❌ Error querying order status: {e}")
+            self.logger.warning("⚠️ Using fallback - marking order as filled to continue trading")
+            self.lighter_order_filled = True
+            self.waiting_for_lighter_fill = False
+            self.order_execution_complete = True
 
     def handle_lighter_order_filled(self, order_data: dict):
         """Handle Lighter order fill notification."""
@@ -479,9 +680,8 @@ class OrderManager:
             filled_amount = order_data.get("filled_base_amount", 0)
             avg_price = order_data.get("avg_filled_price", 0)
 
-            self.logger.info(
-                f"[{client_order_index}] [{order_type}] [Lighter] [FILLED]: "
-                f"{filled_amount} @ {avg_price}")
+            self.logger.info("[%s] [%s] [Lighter] [FILLED]: %s @ %s",
+                             client_order_index, order_type, filled_amount, avg_price)
 
             # Call the callback
             if self.on_order_filled:
@@ -492,9 +692,7 @@ class OrderManager:
             self.order_execution_complete = True
 
         except Exception as e:
-            self.logger.error(f"Error handling Lighter order result: {e}")
-            import traceback
-            self.logger.error(f"Traceback: {traceback.format_exc()}")
+            self.logger.exception("Error handling Lighter order result: %s", e)
 
     def get_edgex_client_order_id(self) -> str:
         """Get current EdgeX client order ID."""
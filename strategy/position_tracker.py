@@ -2,9 +2,11 @@
 import asyncio
 import json
 import logging
-import requests
 import sys
 from decimal import Decimal
+from typing import Optional
+
+import aiohttp
 
 
 class PositionTracker:
@@ -23,6 +25,24 @@ class PositionTracker:
         self.edgex_position = Decimal('0')
         self.lighter_position = Decimal('0')
 
+        # Long-lived HTTP session so Lighter REST calls reuse one keep-alive connection
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=10, keepalive_timeout=60, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     async def get_edgex_position(self) -> Decimal:
         """Get EdgeX position."""
         if not self.edgex_client:
@@ -46,18 +66,20 @@ class PositionTracker:
         headers = {"accept": "application/json"}
 
         current_position = None
-        parameters = {"by": "index", "value": self.account_index}
+        parameters = {"by": "index", "value": str(self.account_index)}
+        session = self._get_session()
         attempts = 0
         while current_position is None and attempts < 10:
             try:
-                response = requests.get(url, headers=headers, params=parameters, timeout=10)
-                response.raise_for_status()
+                async with session.get(url, headers=headers, params=parameters) as response:
+                    response.raise_for_status()
+                    response_text = await response.text()
 
-                if not response.text.strip():
+                if not response_text.strip():
                     self.logger.warning("⚠️ Empty response from Lighter API for position check")
                     return self.lighter_position
 
-                data = response.json()
+                data = json.loads(response_text)
 
                 if 'accounts' not in data or not data['accounts']:
                     self.logger.warning(f"⚠️ Unexpected response format from Lighter API: {data}")
@@ -71,15 +93,17 @@ class PositionTracker:
                 if current_position is None:
                     current_position = 0
 
-            except requests.exceptions.RequestException as e:
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 self.logger.warning(f"⚠️ Network error getting position: {e}")
             except json.JSONDecodeError as e:
                 self.logger.warning(f"⚠️ JSON parsing error in position response: {e}")
-                self.logger.warning(f"Response text: {response.text[:200]}...")
+                self.logger.warning(f"Response text: {response_text[:200]}...")
             except Exception as e:
                 self.logger.warning(f"⚠️ Unexpected error getting position: {e}")
-            finally:
-                attempts += 1
+
+            attempts += 1
+            if current_position is None and attempts < 10:
+                # Only wait before a retry; a successful fetch returns immediately
                 await asyncio.sleep(1)
 
         if current_position is None:
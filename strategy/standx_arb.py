@@ -3,14 +3,17 @@ import asyncio
 import signal
 import logging
 import os
+import queue
 import sys
 import time
-import requests
-import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from decimal import Decimal
-from typing import Tuple
-from datetime import datetime
-import pytz
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+import aiohttp
+import orjson
 
 # Lighter 客户端
 from lighter.signer_client import SignerClient
@@ -30,6 +33,107 @@ from .websocket_manager import WebSocketManagerWrapper
 from .order_manager import OrderManager
 from .standx_position_tracker import StandXPositionTracker
 from .dynamic_threshold import DynamicThresholdCalculator
+from .log_utils import DropQueueHandler, LogQueueListener, beijing_time, ensure_logs_dir
+
+_ZERO = Decimal('0')
+_DUST = Decimal('0.0001')  # fills at or below this are treated as noise
+_DEFAULT_TICK = Decimal('0.1')  # StandX tick until the exchange reports one
+_PRICE_TOLERANCE_PCT = Decimal('0.05')
+
+# Lighter /orderBooks response cached on disk so restarts skip the network round-trip
+_MARKET_CACHE_PATH = Path.home() / '.cache' / 'standx_arb' / 'orderbooks.json'
+_MARKET_CACHE_TTL = 86400  # seconds
+
+
+@dataclass(frozen=True)
+class _EnvConfig:
+    """Environment settings shared by every StandxArb instance."""
+    use_dynamic_threshold: bool
+    dynamic_window: int
+    dynamic_interval: int
+    dynamic_min: Decimal
+    dynamic_max: Decimal
+    dynamic_percentile: float
+    account_index: int
+    api_key_index: int
+    standx_private_key: Optional[str]
+    standx_base_url: str
+    standx_auth_url: str
+
+
+@lru_cache(maxsize=None)
+def _load_env() -> _EnvConfig:
+    """Read the environment once; called lazily so the entrypoint's load_dotenv() has already run."""
+    getenv = os.getenv
+    return _EnvConfig(
+        use_dynamic_threshold=getenv('USE_DYNAMIC_THRESHOLD', 'false').lower() == 'true',
+        dynamic_window=int(getenv('DYNAMIC_THRESHOLD_WINDOW', '1000')),
+        dynamic_interval=int(getenv('DYNAMIC_THRESHOLD_UPDATE_INTERVAL', '300')),
+        dynamic_min=Decimal(getenv('DYNAMIC_THRESHOLD_MIN', '1.0')),
+        dynamic_max=Decimal(getenv('DYNAMIC_THRESHOLD_MAX', '20.0')),
+        dynamic_percentile=float(getenv('DYNAMIC_THRESHOLD_PERCENTILE', '0.70')),
+        account_index=int(getenv('LIGHTER_ACCOUNT_INDEX', 0)),
+        api_key_index=int(getenv('LIGHTER_API_KEY_INDEX', 0)),
+        standx_private_key=getenv('STANDX_PRIVATE_KEY'),
+        standx_base_url=getenv('STANDX_BASE_URL', 'https://perps.standx.com'),
+        standx_auth_url=getenv('STANDX_AUTH_URL', 'https://api.standx.com'),
+    )
+
+
+def _read_market_cache() -> Optional[bytes]:
+    """Cached Lighter order-book list if it is younger than _MARKET_CACHE_TTL, else None."""
+    try:
+        if time.time() - _MARKET_CACHE_PATH.stat().st_mtime < _MARKET_CACHE_TTL:
+            return _MARKET_CACHE_PATH.read_bytes()
+    except OSError:
+        pass
+    return None
+
+
+def _write_market_cache(raw: bytes):
+    """Atomically replace the on-disk market cache (best effort)."""
+    try:
+        _MARKET_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _MARKET_CACHE_PATH.with_suffix('.tmp')
+        tmp.write_bytes(raw)
+        os.replace(tmp, _MARKET_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def _to_dec(v) -> Decimal:
+    """Convert an API number to Decimal; only floats go through str() to avoid binary noise."""
+    if isinstance(v, Decimal):
+        return v
+    if isinstance(v, float):
+        return Decimal(str(v))
+    return Decimal(v)
+
+
+# StandX order statuses that need quantity/price parsing in _handle_standx_order_update
+_RELEVANT_ORDER_STATUSES = frozenset({'FILLED', 'CANCELED', 'OPEN'})
+
+# 支持驼峰和下划线两种字段名格式 (StandX API 返回下划线格式，排在最前)
+_ORDER_ID_KEYS = ('cl_ord_id', 'order_id', 'orderId', 'clOrdId')
+_FILL_QTY_KEYS = ('fill_qty', 'filled_qty', 'filled_size', 'filledSize', 'filledQty')
+_SIZE_KEYS = ('qty', 'size')
+_PRICE_KEYS = ('fill_avg_price', 'price', 'avg_price', 'avgPrice')
+
+
+def _first(d: dict, keys: tuple):
+    """First truthy value among keys (same as chaining d.get(k) with `or`), else None."""
+    get = d.get
+    for k in keys:
+        v = get(k)
+        if v:
+            return v
+    return None
+
+
+def _first_dec(d: dict, keys: tuple) -> Decimal:
+    """First truthy value among keys as Decimal, or _ZERO."""
+    v = _first(d, keys)
+    return _to_dec(v) if v is not None else _ZERO
 
 
 class Config:
@@ -57,24 +161,21 @@ class StandxArb:
         self.max_position = max_position
         self.stop_flag = False
         self._cleanup_done = False
+        self._shutdown_done = False
 
         self.long_ex_threshold = long_ex_threshold
         self.short_ex_threshold = short_ex_threshold
 
-        # Dynamic threshold configuration
-        self.use_dynamic_threshold = os.getenv('USE_DYNAMIC_THRESHOLD', 'false').lower() == 'true'
-        dynamic_window = int(os.getenv('DYNAMIC_THRESHOLD_WINDOW', '1000'))
-        dynamic_interval = int(os.getenv('DYNAMIC_THRESHOLD_UPDATE_INTERVAL', '300'))
-        dynamic_min = Decimal(os.getenv('DYNAMIC_THRESHOLD_MIN', '1.0'))
-        dynamic_max = Decimal(os.getenv('DYNAMIC_THRESHOLD_MAX', '20.0'))
-        dynamic_percentile = float(os.getenv('DYNAMIC_THRESHOLD_PERCENTILE', '0.70'))
+        env = _load_env()
 
+        # Dynamic threshold configuration
+        self.use_dynamic_threshold = env.use_dynamic_threshold
         self.dynamic_threshold = DynamicThresholdCalculator(
-            window_size=dynamic_window,
-            update_interval=dynamic_interval,
-            min_threshold=dynamic_min,
-            max_threshold=dynamic_max,
-            percentile=dynamic_percentile,
+            window_size=env.dynamic_window,
+            update_interval=env.dynamic_interval,
+            min_threshold=env.dynamic_min,
+            max_threshold=env.dynamic_max,
+            percentile=env.dynamic_percentile,
         )
 
         # Setup logger
@@ -93,32 +194,47 @@ class StandxArb:
 
         # Configuration
         self.lighter_base_url = "https://mainnet.zklighter.elliot.ai"
-        self.account_index = int(os.getenv('LIGHTER_ACCOUNT_INDEX', 0))
-        self.api_key_index = int(os.getenv('LIGHTER_API_KEY_INDEX', 0))
-        
+        self.account_index = env.account_index
+        self.api_key_index = env.api_key_index
+
         # StandX Config
-        self.standx_private_key = os.getenv('STANDX_PRIVATE_KEY')
-        self.standx_base_url = os.getenv('STANDX_BASE_URL', 'https://perps.standx.com')
-        self.standx_auth_url = os.getenv('STANDX_AUTH_URL', 'https://api.standx.com')
+        self.standx_private_key = env.standx_private_key
+        self.standx_base_url = env.standx_base_url
+        self.standx_auth_url = env.standx_auth_url
 
         # Contract/market info
         self.standx_symbol = ticker + "-USD" # 假设 StandX 格式为 BTC-USD
-        self.standx_tick_size = Decimal("0.1") # 默认值，初始化时会尝试更新
+        self.standx_tick_size = _DEFAULT_TICK # 默认值，初始化时会尝试更新
         self.lighter_market_index = None
         self.base_amount_multiplier = None
         self.price_multiplier = None
         self.tick_size = None
+        self._lighter_market_config: Optional[Tuple[int, int, int, Decimal]] = None
 
         # Position tracker
         self.position_tracker = None
 
+        # Shared keep-alive HTTP session for Lighter REST calls (created on first use)
+        self._http: Optional[aiohttp.ClientSession] = None
+
+        # Dedicated pool for blocking StandX REST fallback calls (kept off the default executor)
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="standx-rest")
+
         # BBO logging control
         self.last_bbo_log_time = None
         self.last_status_log_time = None
         self.bbo_log_interval = 1800  # 半小时打印一次状态
 
         # Price tolerance
-        self.price_tolerance_pct = Decimal('0.05')
+        self.price_tolerance_pct = _PRICE_TOLERANCE_PCT
+
+        # StandX WS BBO older than this (seconds) is considered stale -> REST fallback
+        self.standx_bbo_max_age = 5.0
+
+        # Exponential backoff for StandX BBO fetch failures (reset on the first good BBO)
+        self.bbo_backoff_min = 0.02
+        self.bbo_backoff_max = 2.0
+        self._bbo_backoff = self.bbo_backoff_min
 
         # Current active order tracking (to filter stale order updates)
         self.current_order_id = None
@@ -128,8 +244,7 @@ class StandxArb:
 
     def _setup_logger(self):
         """Setup logging configuration."""
-        os.makedirs("logs", exist_ok=True)
-        self.log_filename = f"logs/standx_{self.ticker}_log.txt"
+        self.log_filename = f"{ensure_logs_dir()}/standx_{self.ticker}_log.txt"
 
         self.logger = logging.getLogger(f"arbi_standx_{self.ticker}")
         self.logger.setLevel(logging.INFO)
@@ -159,21 +274,19 @@ class StandxArb:
         console_formatter = logging.Formatter('%(levelname)s:%(name)s:[%(filename)s:%(lineno)d]:%(message)s')
 
         # Timezone UTC+8
-        def beijing_time(*args):
-            import time as time_module
-            utc_time = time_module.gmtime(args[0] if args else None)
-            beijing_timestamp = (args[0] if args else time_module.time()) + 28800
-            return time_module.gmtime(beijing_timestamp)
-
         file_formatter.converter = beijing_time
         console_formatter.converter = beijing_time
 
         file_handler.setFormatter(file_formatter)
         console_handler.setFormatter(console_formatter)
 
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # File/console I/O runs on a QueueListener thread; the trading loop only enqueues
+        self._log_queue = queue.Queue(maxsize=100000)
+        self.logger.addHandler(DropQueueHandler(self._log_queue))
         self.logger.propagate = False
+        self._log_listener = LogQueueListener(
+            self._log_queue, file_handler, console_handler, respect_handler_level=True)
+        self._log_listener.start()
 
     def _setup_callbacks(self):
         """Setup callback functions for order updates."""
@@ -190,49 +303,47 @@ class StandxArb:
     def _handle_lighter_order_filled(self, order_data: dict):
         """Handle Lighter order fill."""
         try:
-            if "avg_filled_price" not in order_data:
-                filled_quote = Decimal(order_data.get("filled_quote_amount", 0))
-                filled_base = Decimal(order_data.get("filled_base_amount", 0))
-                if filled_base > 0:
-                    order_data["avg_filled_price"] = filled_quote / filled_base
+            get = order_data.get
+            filled_base_amount = get("filled_base_amount", 0)
+            if "avg_filled_price" in order_data:
+                avg_filled_price = order_data["avg_filled_price"]
+            else:
+                filled_base = _to_dec(filled_base_amount)
+                if filled_base > _ZERO:
+                    avg_filled_price = _to_dec(get("filled_quote_amount", 0)) / filled_base
+                    order_data["avg_filled_price"] = avg_filled_price
                 else:
                     self.logger.error("❌ Cannot calculate avg price: filled_base_amount is 0")
                     return
 
-            if order_data.get("is_ask") or order_data.get("side") == "SELL":
-                order_data["side"] = "SHORT"
+            if get("is_ask") or get("side") == "SELL":
+                side = "SHORT"
                 order_type = "OPEN"
-                if self.position_tracker:
-                    filled_amount = Decimal(str(order_data.get("filled_base_amount", 0)))
-                    self.position_tracker.update_lighter_position(-filled_amount)
+                signed_base = -_to_dec(filled_base_amount)
             else:
-                order_data["side"] = "LONG"
+                side = "LONG"
                 order_type = "CLOSE"
-                if self.position_tracker:
-                    filled_amount = Decimal(str(order_data.get("filled_base_amount", 0)))
-                    self.position_tracker.update_lighter_position(filled_amount)
-
-            client_order_index = order_data.get("client_order_id", "UNKNOWN")
-            filled_base_amount = order_data.get("filled_base_amount", 0)
-            avg_filled_price = order_data.get("avg_filled_price", 0)
+                signed_base = _to_dec(filled_base_amount)
+            order_data["side"] = side
+            if self.position_tracker:
+                self.position_tracker.update_lighter_position(signed_base)
 
-            self.logger.info(
-                f"[{client_order_index}] [{order_type}] [Lighter] [FILLED]: "
-                f"{filled_base_amount} @ {avg_filled_price}")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("[%s] [%s] [Lighter] [FILLED]: %s @ %s",
+                                 get("client_order_id", "UNKNOWN"), order_type, filled_base_amount, avg_filled_price)
 
             self.data_logger.log_trade_to_csv(
                 exchange='lighter',
-                side=order_data['side'],
-                price=str(avg_filled_price),
-                quantity=str(filled_base_amount)
+                side=side,
+                price=avg_filled_price,
+                quantity=filled_base_amount
             )
 
             self.order_manager.lighter_order_filled = True
             self.order_manager.order_execution_complete = True
 
-        except Exception as e:
-            self.logger.error(f"Error handling Lighter order result: {e}")
-            traceback.print_exc()
+        except Exception:
+            self.logger.exception("Error handling Lighter order result")
 
     def _handle_standx_order_update(self, order: dict):
         """
@@ -240,36 +351,36 @@ class StandxArb:
         Triggered by StandXClient.
         """
         try:
-            # 打印关键订单信息
-            self.logger.info(
-                f"📥 [StandX WS] Order: id={order.get('cl_ord_id', '')[:8]}... "
-                f"side={order.get('side')} qty={order.get('qty')} "
-                f"fill={order.get('fill_qty')}@{order.get('fill_avg_price')} "
-                f"status={order.get('status')}"
-            )
-
-            # 过滤合约 - 支持两种字段名格式
+            # 过滤合约 - 支持两种字段名格式 (先做最便宜的检查，无关消息不做任何解析)
             contract_id = order.get('contract_id') or order.get('symbol')
             if contract_id and contract_id != self.standx_symbol:
                 return
 
-            # 支持驼峰和下划线两种字段名格式 (StandX API 返回下划线格式)
-            order_id = order.get('cl_ord_id') or order.get('order_id') or order.get('orderId') or order.get('clOrdId')
             status = (order.get('status') or order.get('orderStatus') or '').upper()
+            if status not in _RELEVANT_ORDER_STATUSES:
+                # 其他状态只记录给 OrderManager，无需解析数量/价格
+                self.order_manager.update_edgex_order_status(status)
+                return
+
+            # 打印关键订单信息
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "📥 [StandX WS] Order: id=%s... side=%s qty=%s fill=%s@%s status=%s",
+                    (order.get('cl_ord_id') or '')[:8], order.get('side'), order.get('qty'),
+                    order.get('fill_qty'), order.get('fill_avg_price'), order.get('status'))
+
+            order_id = _first(order, _ORDER_ID_KEYS)
             side = (order.get('side') or '').lower()
-            # StandX 使用 fill_qty 表示成交数量
-            filled_size = Decimal(str(order.get('fill_qty') or order.get('filled_qty') or order.get('filled_size') or order.get('filledSize') or order.get('filledQty') or '0'))
-            size = Decimal(str(order.get('qty') or order.get('size') or '0'))
-            # StandX 使用 fill_avg_price 表示成交均价
-            price = order.get('fill_avg_price') or order.get('price') or order.get('avg_price') or order.get('avgPrice') or '0'
+            # StandX 使用 fill_qty 表示成交数量, fill_avg_price 表示成交均价
+            filled_size = _first_dec(order, _FILL_QTY_KEYS)
+            size = _first_dec(order, _SIZE_KEYS)
+            price = _first_dec(order, _PRICE_KEYS)
 
             # Determine Order Type (Open/Close) logic
-            if side == 'buy':
-                order_type = "OPEN"
-            else:
-                order_type = "CLOSE"
+            is_buy = side == 'buy'
+            order_type = "OPEN" if is_buy else "CLOSE"
 
-            if status == 'CANCELED' and filled_size > 0:
+            if status == 'CANCELED' and filled_size > _ZERO:
                 status = 'FILLED'
 
             # 模拟 EdgeX 的状态更新逻辑给 OrderManager
@@ -277,36 +388,31 @@ class StandxArb:
             self.order_manager.update_edgex_order_status(status)
 
             # 只处理当前活跃订单的成交，忽略旧订单的延迟通知
-            if status == 'FILLED' and filled_size > 0:
+            if status == 'FILLED' and filled_size > _ZERO:
+                signed_size = filled_size if is_buy else -filled_size
                 if self.current_order_id and order_id != self.current_order_id:
                     self.logger.warning(
                         f"⚠️ [Stale Order] Ignoring fill for old order {order_id}, current={self.current_order_id}")
                     # 仍然更新持仓跟踪，但不触发对冲
                     if self.position_tracker:
-                        if side == 'buy':
-                            self.position_tracker.update_standx_position(filled_size)
-                        else:
-                            self.position_tracker.update_standx_position(-filled_size)
+                        self.position_tracker.update_standx_position(signed_size)
                     return
 
                 self.logger.info(
                     f"✅ [StandX Filled] {side.upper()} {filled_size} @ {price} (id={order_id})")
 
                 if self.position_tracker:
-                    if side == 'buy':
-                        self.position_tracker.update_standx_position(filled_size)
-                    else:
-                        self.position_tracker.update_standx_position(-filled_size)
+                    self.position_tracker.update_standx_position(signed_size)
 
                 self.logger.info(
                     f"[{order_id}] [{order_type}] [StandX] [{status}]: {filled_size} @ {price}")
 
-                if filled_size > 0.0001:
+                if filled_size > _DUST:
                     self.data_logger.log_trade_to_csv(
                         exchange='standx',
                         side=side,
-                        price=str(price),
-                        quantity=str(filled_size)
+                        price=price,
+                        quantity=filled_size
                     )
 
                 # 触发 Lighter 对冲
@@ -327,12 +433,16 @@ class StandxArb:
             elif status == 'OPEN':
                 self.logger.info(f"[{order_id}] [{order_type}] [StandX] [{status}]: {size} @ {price}")
 
-        except Exception as e:
-            self.logger.error(f"Error handling StandX order update: {e}")
-            traceback.print_exc()
+            elif status == 'CANCELED' and order_id == self.current_order_id:
+                # 当前订单已确认撤销且无成交：立即结束 _execute_trade 中的等待
+                self.order_manager.release_hedge_wait()
+
+        except Exception:
+            self.logger.exception("Error handling StandX order update")
 
     def shutdown(self, signum=None, frame=None):
-        if self.stop_flag: return
+        if self._shutdown_done: return
+        self._shutdown_done = True
         self.stop_flag = True
         self.logger.info("\n🛑 Stopping...")
 
@@ -357,9 +467,44 @@ class StandxArb:
         except Exception as e:
             self.logger.error(f"Error closing StandX client: {e}")
 
+        try:
+            if self._http and not self._http.closed:
+                await self._http.close()
+        except Exception as e:
+            self.logger.error(f"Error closing HTTP session: {e}")
+
+        try:
+            if self.position_tracker:
+                await self.position_tracker.close()
+        except Exception as e:
+            self.logger.error(f"Error closing position tracker: {e}")
+
+        self._executor.shutdown(wait=False)
+        self.order_manager.shutdown_sign_executor()
+
+    async def _shutdown_async(self):
+        """Stop the bot from inside the event loop and await cleanup."""
+        self.shutdown()
+        await self._async_cleanup()
+
+    def _on_signal(self):
+        """SIGINT/SIGTERM: only request a stop; run() cleans up once trading_loop has returned."""
+        if not self.stop_flag:
+            self.logger.info("\n🛑 Stop requested, finishing in-flight trade before cleanup...")
+        self.stop_flag = True
+        # 唤醒交易循环和挂单等待，让它们立即看到 stop_flag (挂单会被撤销，已成交的照常对冲)
+        self.order_book_manager.bbo_updated.set()
+        self.order_manager.release_hedge_wait()
+
     def setup_signal_handlers(self):
-        signal.signal(signal.SIGINT, self.shutdown)
-        signal.signal(signal.SIGTERM, self.shutdown)
+        """Register SIGINT/SIGTERM on the running loop (must be called from run())."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._on_signal)
+            except NotImplementedError:
+                # Windows 事件循环不支持 add_signal_handler，退回到同步 handler 并转交给事件循环
+                signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(self._on_signal))
 
     def initialize_lighter_client(self):
         if self.lighter_client is None:
@@ -395,29 +540,62 @@ class StandxArb:
         self.standx_client = StandXClient(config)
         # 绑定 WS 回调
         self.standx_client.setup_order_update_handler(self._handle_standx_order_update)
+        # 绑定 WS 行情回调 (BBO 推送，替代 REST 轮询)
+        self.standx_client.setup_bbo_handler(self.order_book_manager.update_standx_bbo)
         
         self.logger.info("✅ StandX client initialized")
         return self.standx_client
 
-    def get_lighter_market_config(self) -> Tuple[int, int, int, Decimal]:
-        url = f"{self.lighter_base_url}/api/v1/orderBooks"
+    def _get_http(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use."""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=10, keepalive_timeout=60, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._http
+
+    async def get_lighter_market_config(self) -> Tuple[int, int, int, Decimal]:
+        # Market decimals don't change during a run; fetch once and reuse
+        if self._lighter_market_config is not None:
+            return self._lighter_market_config
+
         try:
-            response = requests.get(url, headers={"accept": "application/json"}, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            for market in data.get("order_books", []):
-                if market["symbol"] == self.ticker:
-                    price_multiplier = pow(10, market["supported_price_decimals"])
-                    return (market["market_id"],
-                            pow(10, market["supported_size_decimals"]),
-                            price_multiplier,
-                            Decimal("1") / (Decimal("10") ** market["supported_price_decimals"]))
-            raise Exception(f"Ticker {self.ticker} not found on Lighter")
+            config = None
+            raw = _read_market_cache()
+            if raw is not None:
+                try:
+                    config = self._find_lighter_market(raw)
+                except ValueError:
+                    pass  # 缓存文件损坏，按缓存缺失处理
+            if config is None:
+                # 缓存缺失/过期，或缓存里没有该币种 (新上市)：重新拉取
+                url = f"{self.lighter_base_url}/api/v1/orderBooks"
+                async with self._get_http().get(url, headers={"accept": "application/json"}) as response:
+                    response.raise_for_status()
+                    raw = await response.read()
+                config = self._find_lighter_market(raw)
+                if config is None:
+                    raise Exception(f"Ticker {self.ticker} not found on Lighter")
+                _write_market_cache(raw)
+
+            self._lighter_market_config = config
+            return config
         except Exception as e:
             self.logger.error(f"⚠️ Error getting market config: {e}")
             raise
 
+    def _find_lighter_market(self, raw: bytes) -> Optional[Tuple[int, int, int, Decimal]]:
+        """(market_id, size multiplier, price multiplier, tick) for self.ticker from an /orderBooks body."""
+        for market in orjson.loads(raw).get("order_books", []):
+            if market["symbol"] == self.ticker:
+                price_decimals = market["supported_price_decimals"]
+                return (market["market_id"],
+                        10 ** market["supported_size_decimals"],
+                        10 ** price_decimals,
+                        Decimal(1).scaleb(-price_decimals))
+        return None
+
     async def trading_loop(self):
         """Main trading loop."""
         self.logger.info(f"🚀 Starting StandX arbitrage bot for {self.ticker}")
@@ -425,28 +603,16 @@ class StandxArb:
         try:
             self.initialize_lighter_client()
             self.initialize_standx_client()
-            
-            # Connect StandX (Login + WS)
-            await self.standx_client.connect()
 
-            # Lighter Config
-            (self.lighter_market_index, self.base_amount_multiplier,
-             self.price_multiplier, self.tick_size) = self.get_lighter_market_config()
-
-            # Try to update StandX Tick Size
-            try:
-                ticker_info = self.standx_client.get_ticker(self.standx_symbol)
-                # 简单的 tick size 推断或 hardcode
-                # self.standx_tick_size = ... 
-                pass 
-            except:
-                pass
+            # StandX 登录+WS 连接 与 Lighter 市场配置查询互不依赖，并发进行
+            _, (self.lighter_market_index, self.base_amount_multiplier,
+                self.price_multiplier, self.tick_size) = await asyncio.gather(
+                self.standx_client.connect(), self.get_lighter_market_config())
 
             self.logger.info(f"Infoloaded - SX: {self.standx_symbol}, Lighter ID: {self.lighter_market_index}")
 
-        except Exception as e:
-            self.logger.error(f"❌ Failed to initialize: {e}")
-            traceback.print_exc()
+        except Exception:
+            self.logger.exception("❌ Failed to initialize")
             return
 
         # Initialize position tracker
@@ -472,7 +638,17 @@ class StandxArb:
             self.lighter_client, self.lighter_market_index, self.account_index)
         self.ws_manager.start_lighter_websocket()
 
-        await asyncio.sleep(5)
+        # Start as soon as both books have a first BBO instead of a blind 5s sleep
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(self.order_book_manager.standx_bbo_ready.wait(),
+                               self.order_book_manager.lighter_bbo_ready.wait()),
+                timeout=10)
+            self.logger.info("✅ StandX and Lighter BBO ready")
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                f"⚠️ Timeout waiting for initial BBO (StandX ready={self.order_book_manager.standx_bbo_ready.is_set()}, "
+                f"Lighter ready={self.order_book_manager.lighter_bbo_ready.is_set()}), continuing")
 
         # Initial positions
         # StandX 策略使用 standx_client 获取持仓
@@ -481,102 +657,154 @@ class StandxArb:
 
         self.logger.info(f"📍 Starting main trading loop! st pos:{self.position_tracker.standx_position}, lt pos: {self.position_tracker.lighter_position}")
 
+        # Hoist loop-invariant lookups out of the hot loop
+        bbo_updated = self.order_book_manager.bbo_updated
+        loop = asyncio.get_running_loop()
+        loop_time = loop.time  # monotonic; uvloop returns the cached per-iteration time
+        get_standx_bbo = self.order_book_manager.get_standx_bbo
+        standx_bbo_ready = self.order_book_manager.standx_bbo_ready
+        get_lighter_bbo = self.order_book_manager.get_lighter_bbo
+        position_tracker = self.position_tracker
+        get_position = position_tracker.get_current_standx_position
+        position_event = position_tracker.position_event
+        logger = self.logger
+        log_info = logger.info
+        bbo_log_interval = self.bbo_log_interval
+        dynamic_threshold = self.dynamic_threshold
+        use_dynamic_threshold = self.use_dynamic_threshold
+        standx_bbo_max_age = self.standx_bbo_max_age
+        max_position = self.max_position
+        min_position = -max_position
+        # Threshold source is fixed for the whole run: resolve it once instead of branching every tick
+        get_thresholds = dynamic_threshold.get_thresholds
+        fixed_thresholds = None if use_dynamic_threshold else (self.long_ex_threshold, self.short_ex_threshold)
+        threshold_mode = "dynamic" if use_dynamic_threshold else "fixed"
+        last_stale_warning = float('-inf')
+
         while not self.stop_flag:
-            # 1. Fetch StandX BBO
-            try:
-                # 使用 StandXClient 的 get_ticker 获取价格
-                ticker_data = self.standx_client.get_ticker(self.standx_symbol)
-                ex_best_bid = Decimal(str(ticker_data.get('bid_price') or 0))
-                ex_best_ask = Decimal(str(ticker_data.get('ask_price') or 0))
-                # self.logger.info(f"StandX BBO: {ex_best_bid}/{ex_best_ask}")
-                if ex_best_bid <= 0 or ex_best_ask <= 0:
-                    # self.logger.warning("StandX BBO not ready")
-                    await asyncio.sleep(0.5)
+            # Clear before reading so any update arriving during this iteration wakes the next wait
+            bbo_updated.clear()
+            current_time = loop_time()
+
+            # 1. StandX BBO (WS price stream)
+            ex_best_bid, ex_best_ask = get_standx_bbo(standx_bbo_max_age)
+            if not ex_best_bid or not ex_best_ask:
+                if standx_bbo_ready.is_set():
+                    # WS 已推送过行情但已超过 standx_bbo_max_age：WS 可能静默断开，告警 (限频) 并回退 REST
+                    if current_time - last_stale_warning >= bbo_log_interval:
+                        logger.warning("⚠️ StandX WS BBO older than %.1fs, falling back to REST ticker",
+                                       standx_bbo_max_age)
+                        last_stale_warning = current_time
+                # 冷启动或 WS 行情过期，回退到 REST (在线程中执行，不阻塞事件循环)
+                try:
+                    ticker_data = await loop.run_in_executor(
+                        self._executor, self.standx_client.get_ticker, self.standx_symbol)
+                    ex_best_bid = _to_dec(ticker_data.get('bid_price') or 0)
+                    ex_best_ask = _to_dec(ticker_data.get('ask_price') or 0)
+                    if ex_best_bid <= _ZERO or ex_best_ask <= _ZERO:
+                        await self._bbo_error_backoff()
+                        continue
+                except Exception as e:
+                    self.logger.error(f"Error fetching StandX BBO: {e}")
+                    await self._bbo_error_backoff()
                     continue
-            except Exception as e:
-                self.logger.error(f"Error fetching StandX BBO: {e}")
-                await asyncio.sleep(0.5)
-                continue
+            self._bbo_backoff = self.bbo_backoff_min
 
             # 2. Fetch Lighter BBO
-            lighter_bid, lighter_ask = self.order_book_manager.get_lighter_bbo()
+            lighter_bid, lighter_ask = get_lighter_bbo()
             # self.logger.info(f"Lighter BBO: {lighter_bid}/{lighter_ask}")
         
             # 3. Strategy Logic
             long_ex = False
             short_ex = False
 
-            # Calculate spreads
-            long_spread = (lighter_bid - ex_best_bid) if (lighter_bid and ex_best_bid) else Decimal('0')
-            short_spread = (ex_best_ask - lighter_ask) if (ex_best_ask and lighter_ask) else Decimal('0')
+            # Calculate spreads (StandX BBO is known to be positive at this point)
+            long_spread = (lighter_bid - ex_best_bid) if lighter_bid else _ZERO
+            short_spread = (ex_best_ask - lighter_ask) if lighter_ask else _ZERO
 
             # Add spread observation to dynamic threshold calculator
-            if lighter_bid and ex_best_bid and lighter_ask and ex_best_ask:
-                self.dynamic_threshold.add_spread_observation(long_spread, short_spread)
+            if lighter_bid and lighter_ask:
+                dynamic_threshold.add_spread_observation(long_spread, short_spread, current_time)
 
             # Get current thresholds (dynamic or fixed)
-            if self.use_dynamic_threshold:
-                long_threshold, short_threshold = self.dynamic_threshold.get_thresholds()
-            else:
-                long_threshold = self.long_ex_threshold
-                short_threshold = self.short_ex_threshold
+            long_threshold, short_threshold = fixed_thresholds or get_thresholds()
 
             # Logic: Buy StandX (Maker), Sell Lighter (Taker)
-            if (lighter_bid and ex_best_bid and long_spread > long_threshold):
+            if lighter_bid and long_spread > long_threshold:
                 long_ex = True
 
             # Logic: Sell StandX (Maker), Buy Lighter (Taker)
-            elif (ex_best_ask and lighter_ask and short_spread > short_threshold):
+            elif lighter_ask and short_spread > short_threshold:
                 short_ex = True
 
+            # 本轮只读一次持仓 (日志和下单判断共用；两者之间没有 await，不会变化)
+            current_position = get_position()
+
             # Logging
-            current_time = time.time()
             if (long_ex or short_ex or
                 self.last_status_log_time is None or
-                (current_time - self.last_status_log_time >= self.bbo_log_interval)):
-
-                threshold_mode = "dynamic" if self.use_dynamic_threshold else "fixed"
-                self.logger.info(
-                    f"📊 ST: {ex_best_bid}/{ex_best_ask} | LT: {lighter_bid}/{lighter_ask} | "
-                    f"L_Spr: {long_spread:.2f} | S_Spr: {short_spread:.2f} | "
-                    f"Th({threshold_mode}): {long_threshold:.2f}/{short_threshold:.2f} | "
-                    f"Pos: ST={self.position_tracker.get_current_standx_position()} LT={self.position_tracker.lighter_position}"
-                )
+                (current_time - self.last_status_log_time >= bbo_log_interval)):
+
+                if logger.isEnabledFor(logging.INFO):
+                    log_info(
+                        "📊 ST: %s/%s | LT: %s/%s | L_Spr: %.2f | S_Spr: %.2f | Th(%s): %.2f/%.2f | Pos: ST=%s LT=%s",
+                        ex_best_bid, ex_best_ask, lighter_bid, lighter_ask, long_spread, short_spread,
+                        threshold_mode, long_threshold, short_threshold,
+                        current_position, position_tracker.lighter_position)
                 self.last_status_log_time = current_time
 
             if self.stop_flag: 
-                self.logger.info("🛑 Stop flag detected, exiting trading loop")
+                log_info("🛑 Stop flag detected, exiting trading loop")
                 break
 
             # Execute Trades
-            current_position = self.position_tracker.get_current_standx_position()
-
             if long_ex:
-                if current_position < self.max_position:
-                    self.logger.info(f"🚀 OPPORTUNITY: Long StandX (Spread: {long_spread:.2f} > Th: {long_threshold:.2f})")
+                if current_position < max_position:
+                    log_info("🚀 OPPORTUNITY: Long StandX (Spread: %.2f > Th: %.2f)",
+                             long_spread, long_threshold)
                     # 做多 StandX: 挂买单 @ Ask 附近
                     await self._execute_trade('buy', ex_best_ask, lighter_bid)
                 else:
-                    self.logger.info("⚠️ Max Long Position Reached")
+                    log_info("⚠️ Max Long Position Reached")
                     self.last_status_log_time = current_time
-                    await asyncio.sleep(1)
+                    await self._wait_position_change(position_event)
 
             elif short_ex:
-                if current_position > -1 * self.max_position:
-                    self.logger.info(f"🚀 OPPORTUNITY: Short StandX (Spread: {short_spread:.2f} > Th: {short_threshold:.2f})")
+                if current_position > min_position:
+                    log_info("🚀 OPPORTUNITY: Short StandX (Spread: %.2f > Th: %.2f)",
+                             short_spread, short_threshold)
                     # 做空 StandX: 挂卖单 @ Bid 附近
                     await self._execute_trade('sell', ex_best_bid, lighter_ask)
                 else:
-                    self.logger.info("⚠️ Max Short Position Reached")
+                    log_info("⚠️ Max Short Position Reached")
                     self.last_status_log_time = current_time
-                    await asyncio.sleep(1)
+                    await self._wait_position_change(position_event)
             else:
-                await asyncio.sleep(0.05)
+                # Wake on the next Lighter/StandX BBO change (timeout keeps status logs and stop checks going)
+                try:
+                    await asyncio.wait_for(bbo_updated.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+
+    @staticmethod
+    async def _wait_position_change(position_event: asyncio.Event, timeout: float = 1.0):
+        """At max position: wait for the next position update (fill) or the timeout, whichever comes first."""
+        position_event.clear()
+        try:
+            await asyncio.wait_for(position_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _bbo_error_backoff(self):
+        """Sleep for the current BBO backoff and double it, capped at bbo_backoff_max."""
+        await asyncio.sleep(self._bbo_backoff)
+        self._bbo_backoff = min(self._bbo_backoff * 2, self.bbo_backoff_max)
 
     async def _execute_trade(self, side: str, expected_price: Decimal, hedge_price: Decimal):
         """Execute trade pair (StandX Maker -> Lighter Taker)."""
-        self.order_manager.order_execution_complete = False
-        self.order_manager.waiting_for_lighter_fill = False
+        om = self.order_manager
+        om.order_execution_complete = False
+        om.waiting_for_lighter_fill = False
         self.current_order_id = None  # Reset at start
 
         try:
@@ -609,43 +837,39 @@ class StandxArb:
             # 设置当前订单ID，用于过滤旧订单的延迟成交通知
             self.current_order_id = res.order_id
 
-            # 等待成交 (WS 回调会更新 order_manager.waiting_for_lighter_fill)
-            wait_start = time.time()
-            while not self.order_manager.waiting_for_lighter_fill and not self.stop_flag:
-                await asyncio.sleep(0.01)
-                if time.time() - wait_start > self.fill_timeout:
+            # 等待成交 (WS 回调设置 order_manager.waiting_for_lighter_fill 时立即唤醒；停止信号也会唤醒)
+            if not await om.wait_for_hedge_signal(self.fill_timeout):
+                if self.stop_flag:
+                    self.logger.warning("🛑 Stop requested, cancelling open StandX order...")
+                else:
                     self.logger.warning("⏳ StandX Order Timeout, Cancelling...")
-                    cancel_result = await self.standx_client.cancel_order(res.order_id)
-
-                    # 等待取消确认或成交确认 (最多等待3秒)
-                    cancel_wait_start = time.time()
-                    while time.time() - cancel_wait_start < 3.0:
-                        await asyncio.sleep(0.1)
-                        # 如果在等待取消期间订单成交了，需要继续对冲
-                        if self.order_manager.waiting_for_lighter_fill:
-                            self.logger.info("📥 Order filled during cancel wait, proceeding to hedge...")
-                            break
-
+                # 清掉停止信号留下的唤醒，下面只等这次撤单的 CANCELED / 成交推送
+                om.waiting_for_lighter_fill = False
+                cancel_result = await self.standx_client.cancel_order(res.order_id)
+
+                # 等待取消确认或成交确认 (最多等待3秒，收到当前订单 CANCELED 推送时立即返回)
+                # 如果在等待取消期间订单成交了，需要继续对冲
+                if await om.wait_for_hedge_signal(3.0):
+                    self.logger.info("📥 Order filled during cancel wait, proceeding to hedge...")
+                else:
                     # 如果取消期间没有成交，直接返回
-                    if not self.order_manager.waiting_for_lighter_fill:
-                        self.logger.info("✅ Order cancelled successfully, no fill detected")
-                        self.current_order_id = None  # Clear order ID
-                        return
+                    self.logger.info("✅ Order cancelled successfully, no fill detected")
+                    self.current_order_id = None  # Clear order ID
+                    return
 
             # 执行对冲
-            if self.order_manager.waiting_for_lighter_fill:
+            if om.waiting_for_lighter_fill:
                 self.logger.info("2️⃣ Placing Lighter Hedge Order...")
-                await self.order_manager.place_lighter_market_order(
-                    self.order_manager.current_lighter_side,
-                    self.order_manager.current_lighter_quantity,
-                    self.order_manager.current_lighter_price,
+                await om.place_lighter_market_order(
+                    om.current_lighter_side,
+                    om.current_lighter_quantity,
+                    om.current_lighter_price,
                     self.stop_flag
                 )
                 self.current_order_id = None  # Clear after hedge complete
 
-        except Exception as e:
-            self.logger.error(f"Trade Execution Error: {e}")
-            traceback.print_exc()
+        except Exception:
+            self.logger.exception("Trade Execution Error")
 
     async def run(self):
         """Run the arbitrage bot."""
@@ -659,10 +883,12 @@ class StandxArb:
             self.logger.info("\n🛑 Task cancelled...")
         finally:
             self.logger.info("🔄 Cleaning up...")
-            self.shutdown()
+            # trading_loop 已返回 (进行中的挂单已撤销或已对冲)，此时才关闭连接和线程
             try:
-                await asyncio.wait_for(self._async_cleanup(), timeout=5.0)
+                await asyncio.wait_for(self._shutdown_async(), timeout=5.0)
             except asyncio.TimeoutError:
                 self.logger.warning("⚠️ Cleanup timeout, forcing exit")
             except Exception as e:
-                self.logger.error(f"Error during cleanup: {e}")
\ No newline at end of file
+                self.logger.error(f"Error during cleanup: {e}")
+            # Flush queued log records and stop the listener thread
+            self._log_listener.stop()
\ No newline at end of file
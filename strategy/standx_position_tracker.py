@@ -1,17 +1,25 @@
 """Position tracking for StandX and Lighter exchanges."""
 import asyncio
-import json
 import logging
-import requests
-import sys
+import random
+import time
 from decimal import Decimal
+from typing import Optional
+
+import aiohttp
+import orjson
+
+
+class LighterPositionUnavailable(RuntimeError):
+    """Raised when the Lighter position cannot be fetched after all retries."""
 
 
 class StandXPositionTracker:
     """Tracks positions on StandX and Lighter exchanges."""
 
     def __init__(self, ticker: str, standx_client, standx_symbol: str,
-                 lighter_base_url: str, account_index: int, logger: logging.Logger):
+                 lighter_base_url: str, account_index: int, logger: logging.Logger,
+                 max_retries: int = 5):
         """Initialize position tracker."""
         self.ticker = ticker
         self.standx_client = standx_client
@@ -19,15 +27,59 @@ class StandXPositionTracker:
         self.lighter_base_url = lighter_base_url
         self.account_index = account_index
         self.logger = logger
+        self.max_retries = max_retries
+
+        # Lighter account request is identical on every fetch; build it once (read-only)
+        self._lighter_account_url = f"{lighter_base_url}/api/v1/account"
+        self._lighter_headers = {"accept": "application/json"}
+        self._lighter_params = {"by": "index", "value": str(account_index)}
 
         self.standx_position = Decimal('0')
         self.lighter_position = Decimal('0')
 
-    async def get_standx_position(self) -> Decimal:
-        """Get StandX position."""
+        # Set on every position update so the trading loop can wake on fills instead of sleeping
+        self.position_event = asyncio.Event()
+
+        # Last successful REST Lighter position, reused for lighter_cache_ttl seconds
+        self.lighter_cache_ttl = 0.5
+        self._lighter_cache_value: Optional[Decimal] = None
+        self._lighter_cache_ts = 0.0
+
+        # Circuit breaker: after circuit_threshold failed fetches in a row, skip the API for
+        # circuit_reset seconds and serve the last known position; the next call after that probes again
+        self.circuit_threshold = 5
+        self.circuit_reset = 30.0
+        self._circuit_failures = 0
+        self._circuit_opened_at = 0.0
+
+        # Shared keep-alive HTTP session for Lighter REST calls (created on first use)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=10, keepalive_timeout=60, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def get_standx_position(self, max_age: float = 0.5) -> Decimal:
+        """Get StandX position, reusing the client's last query if it is younger than max_age seconds."""
         if not self.standx_client:
             raise Exception("StandX client not initialized")
 
+        cached = getattr(self.standx_client, 'cached_position', None)
+        if (cached is not None and
+                time.monotonic() - self.standx_client.cached_position_ts < max_age):
+            return cached
+
         positions_data = await self.standx_client.get_account_positions()
         if not positions_data:
             self.logger.warning("No positions or failed to get positions")
@@ -40,57 +92,98 @@ class StandXPositionTracker:
 
     async def get_lighter_position(self) -> Decimal:
         """Get Lighter position."""
-        url = f"{self.lighter_base_url}/api/v1/account"
-        headers = {"accept": "application/json"}
-        parameters = {"by": "index", "value": self.account_index}
+        if (self._lighter_cache_value is not None and
+                time.monotonic() - self._lighter_cache_ts < self.lighter_cache_ttl):
+            return self._lighter_cache_value
+
+        if (self._circuit_failures >= self.circuit_threshold and
+                time.monotonic() - self._circuit_opened_at < self.circuit_reset):
+            return self._lighter_cache_value if self._lighter_cache_value is not None else self.lighter_position
+
+        url = self._lighter_account_url
+        headers = self._lighter_headers
+        parameters = self._lighter_params
 
         current_position = None
+        session = self._get_session()
         attempts = 0
-        while current_position is None and attempts < 10:
+        while current_position is None and attempts < self.max_retries:
             try:
-                response = requests.get(url, headers=headers, params=parameters, timeout=10)
-                response.raise_for_status()
+                async with session.get(url, headers=headers, params=parameters) as response:
+                    response.raise_for_status()
+                    body = await response.read()
 
-                if not response.text.strip():
+                if not body.strip():
                     self.logger.warning("⚠️ Empty response from Lighter API")
                     return self.lighter_position
 
-                data = response.json()
+                data = orjson.loads(body)
                 if 'accounts' not in data or not data['accounts']:
                     self.logger.warning(f"⚠️ Unexpected response: {data}")
                     return self.lighter_position
 
                 positions = data['accounts'][0].get('positions', [])
-                for position in positions:
-                    if position.get('symbol') == self.ticker:
-                        current_position = Decimal(position['position']) * position['sign']
-                        break
-                if current_position is None:
-                    current_position = 0
-
-            except requests.exceptions.RequestException as e:
+                ticker = self.ticker
+                p = next((x for x in positions if x.get('symbol') == ticker), None)
+                if p is not None:
+                    # sign 可能是 int / str / float，统一转成 Decimal 避免混合运算
+                    current_position = Decimal(p['position']) * Decimal(str(p['sign']))
+                else:
+                    current_position = Decimal(0)
+
+            except aiohttp.ClientResponseError as e:
+                if 400 <= e.status < 500 and e.status != 429:
+                    # 4xx (except rate limit) won't fix itself on retry
+                    self.logger.error(f"❌ Lighter API rejected position request: {e.status} {e.message}")
+                    attempts += 1
+                    break
+                self.logger.warning(f"⚠️ HTTP error: {e.status} {e.message}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 self.logger.warning(f"⚠️ Network error: {e}")
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 self.logger.warning(f"⚠️ JSON error: {e}")
             except Exception as e:
                 self.logger.warning(f"⚠️ Error: {e}")
-            finally:
-                attempts += 1
-                await asyncio.sleep(1)
+
+            attempts += 1
+            if current_position is None and attempts < self.max_retries:
+                # Capped exponential backoff with ±25% jitter: 0.5s, 1s, 2s, ... up to 30s
+                delay = min(30.0, 0.5 * (2 ** (attempts - 1)))
+                await asyncio.sleep(delay * random.uniform(0.75, 1.25))
 
         if current_position is None:
             self.logger.error(f"❌ Failed to get Lighter position after {attempts} attempts")
-            sys.exit(1)
-
+            self._circuit_failures += 1
+            if self._circuit_failures >= self.circuit_threshold:
+                # (Re)open the breaker; a failed half-open probe lands here too
+                self._circuit_opened_at = time.monotonic()
+                self.logger.warning(f"⚠️ Lighter position circuit open for {self.circuit_reset}s "
+                                    f"after {self._circuit_failures} failed fetches")
+            raise LighterPositionUnavailable(f"Failed to get Lighter position after {attempts} attempts")
+
+        self._circuit_failures = 0
+        self._lighter_cache_value = current_position
+        self._lighter_cache_ts = time.monotonic()
         return current_position
 
+    def invalidate_lighter_cache(self):
+        """Drop the cached REST Lighter position so the next fetch hits the API."""
+        self._lighter_cache_value = None
+
     def update_standx_position(self, delta: Decimal):
         """Update StandX position by delta."""
+        if delta.__class__ is not Decimal:
+            delta = Decimal(str(delta))
         self.standx_position += delta
+        self.position_event.set()
 
     def update_lighter_position(self, delta: Decimal):
         """Update Lighter position by delta."""
+        if delta.__class__ is not Decimal:
+            delta = Decimal(str(delta))
         self.lighter_position += delta
+        self.invalidate_lighter_cache()
+        self.position_event.set()
 
     def get_current_standx_position(self) -> Decimal:
         """Get current StandX position (cached)."""
@@ -3,12 +3,16 @@ import asyncio
 import json
 import logging
 import time
-import traceback
+import orjson
 import websockets
 from typing import Callable, Optional
 
 from edgex_sdk import WebSocketManager
 
+# Lighter message types too frequent to log on receipt
+_QUIET_LIGHTER_MSG_TYPES = frozenset({"update/order_book", "ping"})
+_LIGHTER_PONG = json.dumps({"type": "pong"})
+
 
 class WebSocketManagerWrapper:
     """Manages WebSocket connections for both exchanges."""
@@ -158,7 +162,8 @@ class WebSocketManagerWrapper:
                 # Reset order book state before connecting
                 await self.order_book_manager.reset_lighter_order_book()
 
-                async with websockets.connect(url) as ws:
+                # compression=None: 跳过 permessage-deflate，每帧省一次 zlib 解压
+                async with websockets.connect(url, compression=None) as ws:
                     # Subscribe to order book updates
                     await ws.send(json.dumps({
                         "type": "subscribe",
@@ -210,22 +215,22 @@ class WebSocketManagerWrapper:
                             msg = await asyncio.wait_for(ws.recv(), timeout=1)
 
                             try:
-                                data = json.loads(msg)
+                                data = orjson.loads(msg)
                                 # Log all message types for debugging (except frequent order_book updates)
                                 msg_type = data.get("type", "UNKNOWN")
-                                if msg_type not in ["update/order_book", "ping"]:
+                                if msg_type not in _QUIET_LIGHTER_MSG_TYPES:
                                     self.logger.info(f"📬 [Lighter WS] Received message type: {msg_type}")
                                     # If message type is UNKNOWN, log the full message to debug
                                     if msg_type == "UNKNOWN":
                                         self.logger.warning(f"⚠️ [Lighter WS] UNKNOWN message content: {data}")
-                            except json.JSONDecodeError as e:
+                            except orjson.JSONDecodeError as e:
                                 self.logger.warning(f"⚠️ JSON parsing error: {e}")
                                 continue
 
                             timeout_count = 0
 
                             async with self.order_book_manager.lighter_order_book_lock:
-                                if data.get("type") == "subscribed/order_book":
+                                if msg_type == "subscribed/order_book":
                                     # Initial snapshot
                                     self.order_book_manager.lighter_order_book["bids"].clear()
                                     self.order_book_manager.lighter_order_book["asks"].clear()
@@ -251,12 +256,12 @@ class WebSocketManagerWrapper:
                                         f"{len(self.order_book_manager.lighter_order_book['bids'])} bids and "
                                         f"{len(self.order_book_manager.lighter_order_book['asks'])} asks")
 
-                                elif data.get("type") == "subscribed/account_orders":
+                                elif msg_type == "subscribed/account_orders":
                                     # Account orders subscription confirmed
                                     channel = data.get("channel", "UNKNOWN")
                                     self.logger.info(f"✅ [Lighter WS] Account orders subscription confirmed for channel: {channel}")
 
-                                elif (data.get("type") == "update/order_book" and
+                                elif (msg_type == "update/order_book" and
                                       self.order_book_manager.lighter_snapshot_loaded):
                                     order_book = data.get("order_book", {})
                                     if not order_book or "offset" not in order_book:
@@ -281,10 +286,10 @@ class WebSocketManagerWrapper:
 
                                     self.order_book_manager.update_lighter_bbo()
 
-                                elif data.get("type") == "ping":
-                                    await ws.send(json.dumps({"type": "pong"}))
+                                elif msg_type == "ping":
+                                    await ws.send(_LIGHTER_PONG)
 
-                                elif data.get("type") == "update/account_orders":
+                                elif msg_type == "update/account_orders":
                                     orders = data.get("orders", {}).get(str(self.lighter_market_index), [])
                                     self.logger.info(
                                         f"📨 [Lighter Order Update] Received {len(orders)} order(s) for market {self.lighter_market_index}")
@@ -300,7 +305,7 @@ class WebSocketManagerWrapper:
                                                 f"⚠️ [Lighter Order] Received order with status '{order_status}' "
                                                 f"(not 'filled'), order data: {order}")
 
-                                elif (data.get("type") == "update/order_book" and
+                                elif (msg_type == "update/order_book" and
                                       not self.order_book_manager.lighter_snapshot_loaded):
                                     continue
 
@@ -329,8 +334,7 @@ class WebSocketManagerWrapper:
                             self.logger.warning(f"⚠️ Lighter websocket error: {e}")
                             break
                         except Exception as e:
-                            self.logger.error(f"⚠️ Error in Lighter websocket: {e}")
-                            self.logger.error(f"⚠️ Full traceback: {traceback.format_exc()}")
+                            self.logger.exception(f"⚠️ Error in Lighter websocket: {e}")
                             break
             except Exception as e:
                 self.logger.error(f"⚠️ Failed to connect to Lighter websocket: {e}")
@@ -5,6 +5,7 @@ Test script to verify EdgeX account connection and trading capabilities.
 
 import os
 import asyncio
+import itertools
 from decimal import Decimal
 from dotenv import load_dotenv
 from edgex_sdk import Client
@@ -46,13 +47,24 @@ async def test_edgex_connection():
 
         print("✅ EdgeX client initialized successfully!")
 
+        # Steps 2/3/4/6 are independent reads: issue them concurrently,
+        # then report each result in step order below
+        account_asset, metadata, positions_data, active_orders_data = await asyncio.gather(
+            client.get_account_asset(),
+            client.get_metadata(),
+            client.get_account_positions(),
+            client.get_active_orders(),
+            return_exceptions=True
+        )
+
         # Step 2: Get account asset information
         print("\n" + "-" * 60)
         print("Step 2: Fetching account asset information...")
         print("-" * 60)
 
         try:
-            account_asset = await client.get_account_asset()
+            if isinstance(account_asset, Exception):
+                raise account_asset
 
             if account_asset:
                 print(f"✅ Account asset info retrieved!")
@@ -76,14 +88,15 @@ async def test_edgex_connection():
         print("-" * 60)
 
         try:
-            metadata = await client.get_metadata()
+            if isinstance(metadata, Exception):
+                raise metadata
 
             if metadata and 'data' in metadata and 'contracts' in metadata['data']:
                 contracts = metadata['data']['contracts']
                 print(f"✅ Found {len(contracts)} available contracts:")
 
                 # Show first 5 contracts
-                for contract in list(contracts.values())[:5]:
+                for contract in itertools.islice(contracts.values(), 5):
                     symbol = contract.get('symbol', 'N/A')
                     contract_id = contract.get('id', 'N/A')
                     status = contract.get('status', 'N/A')
@@ -93,11 +106,8 @@ async def test_edgex_connection():
                     print(f"    ... and {len(contracts) - 5} more")
 
                 # Find ETH contract for testing
-                eth_contract = None
-                for contract in contracts.values():
-                    if contract.get('symbol') == 'ETH':
-                        eth_contract = contract
-                        break
+                by_symbol = {c['symbol']: c for c in contracts.values() if 'symbol' in c}
+                eth_contract = by_symbol.get('ETH')
 
                 if eth_contract:
                     print(f"\n  ETH Contract Details:")
@@ -119,7 +129,8 @@ async def test_edgex_connection():
         print("-" * 60)
 
         try:
-            positions_data = await client.get_account_positions()
+            if isinstance(positions_data, Exception):
+                raise positions_data
 
             if positions_data and 'data' in positions_data:
                 positions = positions_data['data']
@@ -151,7 +162,8 @@ async def test_edgex_connection():
         print("-" * 60)
 
         try:
-            active_orders_data = await client.get_active_orders()
+            if isinstance(active_orders_data, Exception):
+                raise active_orders_data
 
             if active_orders_data and 'data' in active_orders_data:
                 active_orders = active_orders_data['data']
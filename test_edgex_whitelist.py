@@ -28,6 +28,7 @@ async def test_whitelist():
         print("❌ Missing credentials in .env file")
         return False
 
+    client = None
     try:
         # Initialize client
         client = Client(
@@ -45,7 +46,6 @@ async def test_whitelist():
         print("\n✅ SUCCESS: Account is whitelisted!")
         print(f"\nResponse data: {result}")
 
-        await client.close()
         return True
 
     except Exception as e:
@@ -60,6 +60,10 @@ async def test_whitelist():
             print(f"\n❌ FAILED: {e}")
 
         return False
+    finally:
+        # A rejected (non-whitelisted) request must not leak the client's HTTP session
+        if client is not None:
+            await client.close()
 
 if __name__ == "__main__":
     result = asyncio.run(test_whitelist())
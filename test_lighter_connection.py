@@ -5,6 +5,7 @@ Test script to verify Lighter account connection.
 
 import os
 import asyncio
+from decimal import Decimal
 from dotenv import load_dotenv
 from lighter import SignerClient, ApiClient, Configuration
 import lighter
@@ -12,25 +13,20 @@ import lighter
 # Load environment variables
 load_dotenv()
 
-def print_lighter_client_methods():
-    """Print all available methods in Lighter SignerClient."""      
-    python3 << 'EOF'    
-    from lighter.signer_client import SignerClient
-    import inspect
+_ZERO_POSITIONS = ('0', '0.0', '0.00000000')
+_DUST = Decimal('0.0001')
 
+def print_lighter_client_methods():
+    """Print all available methods in Lighter SignerClient."""
     # 获取所有公开方法
-    methods = [m for m in dir(SignerClient) if not m.startswith('_')]
+    methods = sorted(m for m in dir(SignerClient) if not m.startswith('_'))
 
     print("=== All available methods in SignerClient ===")
-    for method in sorted(methods):
-        print(f"  - {method}")
+    print('\n'.join(f"  - {m}" for m in methods))
 
     print("\n=== Methods containing 'get' ===")
     get_methods = [m for m in methods if 'get' in m.lower()]
-    for method in sorted(get_methods):
-        print(f"  - {method}")
-    EOF
-
+    print('\n'.join(f"  - {m}" for m in get_methods))
 
 
 async def test_lighter_connection():
@@ -55,6 +51,7 @@ async def test_lighter_connection():
         print("\n❌ Error: API_KEY_PRIVATE_KEY not set in environment")
         return False
 
+    api_client = None
     try:
         # Step 1: Initialize Lighter client
         print("\n" + "-" * 60)
@@ -89,7 +86,12 @@ async def test_lighter_connection():
         # Step 4: Test account API - Get account info
         print("\nStep 4: Fetching account information...")
         account_api = lighter.AccountApi(api_client)
-        account_data = await account_api.account(by="index", value=str(account_index))
+        order_api = lighter.OrderApi(api_client)
+        # account 和 order_books 互不依赖，并发请求；Step 5 直接使用结果
+        account_data, order_books = await asyncio.gather(
+            account_api.account(by="index", value=str(account_index)),
+            order_api.order_books()
+        )
 
         if account_data and account_data.accounts:
             account = account_data.accounts[0]
@@ -97,16 +99,18 @@ async def test_lighter_connection():
             print(f"\n  Account Details:")
             # Print available attributes
             print(f"    Account Index: {account_index}")
-            if hasattr(account, 'address'):
-                print(f"    Address: {account.address}")
-            if hasattr(account, 'wallet_address'):
-                print(f"    Wallet Address: {account.wallet_address}")
+            for attr, label in (('address', 'Address'), ('wallet_address', 'Wallet Address')):
+                value = getattr(account, attr, None)
+                if value is not None:
+                    print(f"    {label}: {value}")
 
             # Show positions
             if account.positions:
                 print(f"\n  Positions ({len(account.positions)}):")
                 for pos in account.positions:
-                    if abs(float(pos.position)) > 0.0001:
+                    # 大多数是 "0"：先按字符串跳过，再用 Decimal 比较阈值
+                    if (pos.position and pos.position not in _ZERO_POSITIONS
+                            and Decimal(pos.position).copy_abs() > _DUST):
                         print(f"    - Market ID {pos.market_id}: {pos.position} (Avg Price: {pos.avg_price})")
             else:
                 print("\n  Positions: None")
@@ -119,9 +123,6 @@ async def test_lighter_connection():
         print("Step 5: Fetching available markets...")
         print("-" * 60)
 
-        order_api = lighter.OrderApi(api_client)
-        order_books = await order_api.order_books()
-
         if order_books and order_books.order_books:
             print(f"✅ Found {len(order_books.order_books)} available markets:")
             for market in order_books.order_books[:5]:  # Show first 5 markets
@@ -167,9 +168,6 @@ async def test_lighter_connection():
             else:
                 print(f"✅ No active orders found for market {test_market_id} (this is normal)")
 
-        # Close API client
-        await api_client.close()
-
         # Final summary
         print("\n" + "=" * 60)
         print("✅ All tests passed! Lighter account is properly configured.")
@@ -182,6 +180,10 @@ async def test_lighter_connection():
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        # Close API client on every path so a failed step doesn't leak its connection pool
+        if api_client is not None:
+            await api_client.close()
 
 if __name__ == "__main__":
     result = asyncio.run(test_lighter_connection())
@@ -2,37 +2,195 @@
 """
 Test script to verify StandX account connection.
 Tests REST API login, price fetching, and position queries.
+
+Pass --reuse-token (or set STANDX_REUSE_TOKEN=1) to reuse a cached login token
+from ~/.standx_token.json instead of signing in again. Without it the token is
+neither read from nor written to that file.
 """
 
 import os
+import ssl
+import sys
 import asyncio
-import json
 import base64
-import requests
+import time
+import aiohttp
+import orjson
+from pathlib import Path
 from decimal import Decimal
+from functools import lru_cache
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 # Solana dependencies
-import base58
 from solders.keypair import Keypair
 
 
+_TOKEN_CACHE_PATH = Path.home() / '.standx_token.json'
+_TOKEN_TTL = 604800  # 与登录请求的 expiresSeconds 一致
+_TOKEN_MIN_REMAINING = 60  # 剩余有效期不足 60s 时重新登录
+
+_BAR = "=" * 60
+_MASK = "*" * 20
+
+# 签名 payload 中 input 部分按顺序取自 JWT 的字段
+_SIGN_FIELDS = ("domain", "address", "statement", "uri", "version", "chainId", "nonce", "issuedAt", "requestId")
+
+
+@lru_cache(maxsize=4)
+def _load_keypair(private_key_b58: str) -> Keypair:
+    """Parse a base58 Solana keypair once per process and reuse the instance."""
+    return Keypair.from_base58_string(private_key_b58)
+
+
+def _load_cached_token(address: str):
+    """Return the cached bearer token for address if it is still valid, else None."""
+    try:
+        cache = orjson.loads(_TOKEN_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if cache.get('address') == address and cache.get('expires_at', 0) > time.time() + _TOKEN_MIN_REMAINING:
+        return cache.get('token')
+    return None
+
+
+def _save_cached_token(address: str, token: str):
+    """Atomically write the token cache, readable by the owner only (best effort)."""
+    tmp = _TOKEN_CACHE_PATH.with_suffix('.tmp')
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps({'address': address, 'token': token, 'expires_at': time.time() + _TOKEN_TTL}))
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, _TOKEN_CACHE_PATH)
+    except OSError:
+        pass
+
+
+_RETRY_STATUSES = frozenset((502, 503, 504))
+_RETRY_ATTEMPTS = 3
+_RETRY_BACKOFF = 0.2  # 秒，按 0.2 / 0.4 / 0.8 递增
+
+
+async def _request(session: aiohttp.ClientSession, method: str, url: str, **kwargs):
+    """
+    Send one REST request on the shared session, retrying connection errors, timeouts
+    and 502/503/504 with backoff. Returns (ok, status, body): parsed JSON when ok, text otherwise.
+    """
+    for attempt in range(_RETRY_ATTEMPTS + 1):
+        try:
+            async with session.request(method, url, **kwargs) as resp:
+                if resp.status not in _RETRY_STATUSES or attempt == _RETRY_ATTEMPTS:
+                    if resp.ok:
+                        return True, resp.status, await resp.json(content_type=None, loads=orjson.loads)
+                    return False, resp.status, await resp.text()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == _RETRY_ATTEMPTS:
+                raise
+        await asyncio.sleep(_RETRY_BACKOFF * (2 ** attempt))
+
+
 def print_section(title: str):
-    """Print a section header."""
-    print("\n" + "=" * 60)
-    print(title)
-    print("=" * 60)
+    """Print a section header and flush, so it shows before the section's own work starts."""
+    print(f"\n{_BAR}\n{title}\n{_BAR}", flush=True)
 
 
 def print_step(step_num: int, description: str):
-    """Print a step header."""
-    print(f"\n--- Step {step_num}: {description} ---")
+    """Print a step header and flush, so a step that hangs on the network is visible while it runs."""
+    print(f"\n--- Step {step_num}: {description} ---", flush=True)
+
+
+async def _login(session: aiohttp.ClientSession, auth_url: str, keypair: Keypair, save_token: bool = False):
+    """
+    Run the full sign-in flow (steps 2-5). Returns the bearer token, or None on failure.
+    The token is written to the cache file only when save_token is set.
+    """
+    pubkey = keypair.pubkey()
+    wallet_address = str(pubkey)
+
+    # Step 2: Prepare sign-in
+    print_step(2, "Preparing Sign-In Request")
+
+    req_id = wallet_address
+    prepare_url = f"{auth_url}/v1/offchain/prepare-signin?chain=solana"
+
+    ok, status, data = await _request(
+        session, "POST", prepare_url,
+        json={"address": wallet_address, "requestId": req_id}
+    )
+    if not ok:
+        print(f"❌ Prepare request failed: {status} - {data}")
+        return None
+
+    if not data.get("success"):
+        print(f"❌ API Error: {data.get('message')}")
+        return None
+
+    signed_data_jwt = data["signedData"]
+    print(f"✅ Prepare sign-in successful!")
+    print(f"   JWT received: {signed_data_jwt[:50]}...")
+
+    # Step 3: Parse JWT and sign message
+    print_step(3, "Signing Authentication Message")
+
+    parts = signed_data_jwt.split('.')
+    # JWT 段是无填充的 base64url；多余的 '=' 解码时会被忽略
+    jwt_payload = orjson.loads(base64.urlsafe_b64decode(parts[1] + '=='))
+
+    msg_bytes = jwt_payload.get("message").encode('utf-8')
+    raw_sig = bytes(keypair.sign_message(msg_bytes))
+
+    print(f"✅ Message signed!")
+    print(f"   Message: {jwt_payload.get('message')[:50]}...")
+
+    # Step 4: Construct complex signature
+    print_step(4, "Constructing Signature Payload")
+
+    input_data = {k: jwt_payload.get(k) for k in _SIGN_FIELDS}
+    output_data = {
+        "account": {"publicKey": list(bytes(pubkey))},
+        "signature": list(raw_sig),
+        "signedMessage": list(msg_bytes)
+    }
+    complex_obj = {"input": input_data, "output": output_data}
+    final_sig = base64.b64encode(orjson.dumps(complex_obj)).decode('ascii')
+
+    print(f"✅ Signature payload constructed!")
+
+    # Step 5: Login
+    print_step(5, "Logging In to StandX")
+
+    login_url = f"{auth_url}/v1/offchain/login?chain=solana"
+    ok, status, result = await _request(
+        session, "POST", login_url,
+        json={
+            "signature": final_sig,
+            "signedData": signed_data_jwt,
+            "expiresSeconds": 604800
+        }
+    )
+    if not ok:
+        print(f"❌ Login failed: {status} - {result}")
+        return None
+
+    token = result.get("token")
+
+    if not token:
+        print(f"❌ No token in response: {result}")
+        return None
+
+    print(f"✅ Login successful!")
+    print(f"   Token: {token[:30]}...{token[-10:]}")
+    print(f"   Address: {result.get('address', 'N/A')}")
 
+    if save_token:
+        _save_cached_token(wallet_address, token)
+    return token
 
-async def test_standx_connection():
+
+async def test_standx_connection(reuse_token: bool = False):
     """Test StandX account connection and basic operations."""
 
     # Configuration
@@ -47,123 +205,66 @@ async def test_standx_connection():
     print(f"  Base URL: {base_url}")
     print(f"  Auth URL: {auth_url}")
     print(f"  Symbol: {symbol}")
-    print(f"  Private Key: {'*' * 20}...{private_key[-8:] if private_key else 'NOT SET'}")
+    print(f"  Private Key: {_MASK}...{private_key[-8:] if private_key else 'NOT SET'}")
 
     if not private_key:
         print("\n❌ Error: STANDX_PRIVATE_KEY not set in environment")
         return False
 
+    # REST 和 WSS 共用一个 SSLContext，CA 证书只加载一次
+    ssl_ctx = ssl.create_default_context()
+
+    # 一个 keep-alive 会话贯穿所有 REST 步骤，同一 host 的后续请求复用 TCP/TLS 连接
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit_per_host=10, keepalive_timeout=60, ttl_dns_cache=300, ssl=ssl_ctx),
+        timeout=aiohttp.ClientTimeout(total=10)
+    )
     try:
         # Step 1: Load Solana wallet
         print_step(1, "Loading Solana Wallet")
 
         clean_key = private_key.replace("0x", "").strip()
-        keypair = Keypair.from_bytes(base58.b58decode(clean_key))
-        wallet_address = str(keypair.pubkey())
+        keypair = _load_keypair(clean_key)
+        pubkey = keypair.pubkey()
+        wallet_address = str(pubkey)
 
         print(f"✅ Wallet loaded successfully!")
         print(f"   Address: {wallet_address}")
 
-        # Step 2: Prepare sign-in
-        print_step(2, "Preparing Sign-In Request")
-
-        req_id = wallet_address
-        prepare_url = f"{auth_url}/v1/offchain/prepare-signin?chain=solana"
-
-        resp = requests.post(
-            prepare_url,
-            json={"address": wallet_address, "requestId": req_id},
-            timeout=10
-        )
+        # 缓存 token 仅在显式开启时复用（--reuse-token 或 STANDX_REUSE_TOKEN=1），默认每次都完整测试登录
+        token = _load_cached_token(wallet_address) if reuse_token else None
+        token_from_cache = token is not None
+        if token_from_cache:
+            print("\nℹ️  Using cached token, skipping steps 2-5")
+            print(f"   Token: {token[:30]}...{token[-10:]}")
+        else:
+            token = await _login(session, auth_url, keypair, save_token=reuse_token)
+            if not token:
+                return False
 
-        if not resp.ok:
-            print(f"❌ Prepare request failed: {resp.status_code} - {resp.text}")
-            return False
-
-        data = resp.json()
-        if not data.get("success"):
-            print(f"❌ API Error: {data.get('message')}")
-            return False
-
-        signed_data_jwt = data["signedData"]
-        print(f"✅ Prepare sign-in successful!")
-        print(f"   JWT received: {signed_data_jwt[:50]}...")
-
-        # Step 3: Parse JWT and sign message
-        print_step(3, "Signing Authentication Message")
-
-        parts = signed_data_jwt.split('.')
-        padded = parts[1] + '=' * (4 - len(parts[1]) % 4)
-        jwt_payload = json.loads(base64.b64decode(padded).decode('utf-8'))
-
-        msg_bytes = jwt_payload.get("message").encode('utf-8')
-        raw_sig = bytes(keypair.sign_message(msg_bytes))
-
-        print(f"✅ Message signed!")
-        print(f"   Message: {jwt_payload.get('message')[:50]}...")
-
-        # Step 4: Construct complex signature
-        print_step(4, "Constructing Signature Payload")
-
-        input_data = {
-            "domain": jwt_payload.get("domain"),
-            "address": jwt_payload.get("address"),
-            "statement": jwt_payload.get("statement"),
-            "uri": jwt_payload.get("uri"),
-            "version": jwt_payload.get("version"),
-            "chainId": jwt_payload.get("chainId"),
-            "nonce": jwt_payload.get("nonce"),
-            "issuedAt": jwt_payload.get("issuedAt"),
-            "requestId": jwt_payload.get("requestId")
-        }
-        output_data = {
-            "account": {"publicKey": list(bytes(keypair.pubkey()))},
-            "signature": list(raw_sig),
-            "signedMessage": list(msg_bytes)
-        }
-        complex_obj = {"input": input_data, "output": output_data}
-        json_str = json.dumps(complex_obj, separators=(',', ':'))
-        final_sig = base64.b64encode(json_str.encode('utf-8')).decode('utf-8')
-
-        print(f"✅ Signature payload constructed!")
-
-        # Step 5: Login
-        print_step(5, "Logging In to StandX")
-
-        login_url = f"{auth_url}/v1/offchain/login?chain=solana"
-        resp = requests.post(
-            login_url,
-            json={
-                "signature": final_sig,
-                "signedData": signed_data_jwt,
-                "expiresSeconds": 604800
-            },
-            timeout=10
+        # Step 6/7 的两个 GET 互不依赖，并发发出，再按步骤顺序打印结果
+        price_url = f"{base_url}/api/query_symbol_price"
+        positions_url = f"{base_url}/api/query_positions"
+        (price_ok, price_status, price_data), (positions_ok, positions_status, positions) = await asyncio.gather(
+            _request(session, "GET", price_url, params={"symbol": symbol}),
+            _request(session, "GET", positions_url, params={"symbol": symbol},
+                     headers={"Authorization": f"Bearer {token}"})
         )
 
-        if not resp.ok:
-            print(f"❌ Login failed: {resp.status_code} - {resp.text}")
-            return False
-
-        result = resp.json()
-        token = result.get("token")
-
-        if not token:
-            print(f"❌ No token in response: {result}")
-            return False
-
-        print(f"✅ Login successful!")
-        print(f"   Token: {token[:30]}...{token[-10:]}")
-        print(f"   Address: {result.get('address', 'N/A')}")
+        # 缓存 token 被服务端拒绝（提前失效/被吊销）时回退到完整登录，再重试一次
+        if positions_status == 401 and token_from_cache:
+            print("\n⚠️ Cached token rejected (401), logging in again")
+            token = await _login(session, auth_url, keypair, save_token=reuse_token)
+            if not token:
+                return False
+            positions_ok, positions_status, positions = await _request(
+                session, "GET", positions_url, params={"symbol": symbol},
+                headers={"Authorization": f"Bearer {token}"})
 
         # Step 6: Test price API
         print_step(6, "Fetching Price Data")
 
-        price_url = f"{base_url}/api/query_symbol_price"
-        resp = requests.get(price_url, params={"symbol": symbol}, timeout=10)
-
-        if resp.ok:
-            price_data = resp.json()
+        if price_ok:
             bid = price_data.get("spread_bid", 0)
             ask = price_data.get("spread_ask", 0)
             print(f"✅ Price data received!")
@@ -172,21 +273,12 @@ async def test_standx_connection():
             print(f"   Ask: {ask}")
             print(f"   Spread: {float(ask) - float(bid) if bid and ask else 'N/A'}")
         else:
-            print(f"⚠️ Price API returned: {resp.status_code} - {resp.text}")
+            print(f"⚠️ Price API returned: {price_status} - {price_data}")
 
         # Step 7: Test positions API
         print_step(7, "Fetching Positions")
 
-        positions_url = f"{base_url}/api/query_positions"
-        resp = requests.get(
-            positions_url,
-            params={"symbol": symbol},
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=10
-        )
-
-        if resp.ok:
-            positions = resp.json()
+        if positions_ok:
             if isinstance(positions, list):
                 if positions:
                     print(f"✅ Found {len(positions)} position(s):")
@@ -198,7 +290,7 @@ async def test_standx_connection():
             else:
                 print(f"⚠️ Unexpected response format: {positions}")
         else:
-            print(f"⚠️ Positions API returned: {resp.status_code} - {resp.text}")
+            print(f"⚠️ Positions API returned: {positions_status} - {positions}")
 
         # Step 8: Test WebSocket connectivity (basic check)
         print_step(8, "Testing WebSocket Endpoint")
@@ -211,7 +303,11 @@ async def test_standx_connection():
 
             async def test_ws():
                 try:
-                    async with websockets.connect(ws_url, close_timeout=5) as ws:
+                    # 与 StandXWebSocketManager 一致：不启用 permessage-deflate；限制单帧 1 MiB
+                    # 测试连接即开即关：不启动 ping 任务，握手 3s 超时快速失败
+                    async with websockets.connect(ws_url, ssl=ssl_ctx, open_timeout=3, close_timeout=2,
+                                                  ping_interval=None, ping_timeout=None,
+                                                  compression=None, max_size=2 ** 20) as ws:
                         # Send auth
                         auth_payload = {
                             "auth": {
@@ -219,11 +315,12 @@ async def test_standx_connection():
                                 "streams": [{"channel": "order"}]
                             }
                         }
-                        await ws.send(json.dumps(auth_payload))
+                        # 以 str 发送，保持 text frame
+                        await ws.send(orjson.dumps(auth_payload).decode())
 
                         # Wait for response
                         response = await asyncio.wait_for(ws.recv(), timeout=5)
-                        data = json.loads(response)
+                        data = orjson.loads(response)
 
                         if data.get("channel") == "auth":
                             auth_result = data.get("data", {})
@@ -253,12 +350,19 @@ async def test_standx_connection():
         return True
 
     except Exception as e:
-        print(f"\n❌ Error during connection test: {e}")
+        # traceback 写 stderr；先 flush 缓冲的 stdout，保证失败步骤的输出出现在 traceback 之前
+        print(f"\n❌ Error during connection test: {e}", flush=True)
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        await session.close()
 
 
 if __name__ == "__main__":
-    result = asyncio.run(test_standx_connection())
+    # 关闭行缓冲：步骤标题立即 flush，步骤内的多行结果合并成一次 write，随下一个标题一起输出
+    sys.stdout.reconfigure(line_buffering=False)
+    reuse_token = '--reuse-token' in sys.argv[1:] or os.getenv('STANDX_REUSE_TOKEN', '').lower() in ('1', 'true', 'yes')
+    result = asyncio.run(test_standx_connection(reuse_token=reuse_token))
+    sys.stdout.flush()
     exit(0 if result else 1)